@@ -0,0 +1,30 @@
+"""Assets trigram search indexes
+
+Revision ID: 6e2b7c1d9a40
+Revises: d0fa4f1646f4
+Create Date: 2026-10-18 11:02:47.518930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2b7c1d9a40'
+down_revision: Union[str, Sequence[str], None] = 'd0fa4f1646f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_assets_ticker_trgm', 'assets', ['ticker'], unique=False, postgresql_using='gin', postgresql_ops={'ticker': 'gin_trgm_ops'})
+    op.create_index('ix_assets_name_trgm', 'assets', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_assets_name_trgm', table_name='assets', postgresql_using='gin')
+    op.drop_index('ix_assets_ticker_trgm', table_name='assets', postgresql_using='gin')
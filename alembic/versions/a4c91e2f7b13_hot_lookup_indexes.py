@@ -0,0 +1,33 @@
+"""Hot lookup indexes for allocations and logs
+
+Revision ID: a4c91e2f7b13
+Revises: 6e2b7c1d9a40
+Create Date: 2026-10-18 11:48:05.220614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c91e2f7b13'
+down_revision: Union[str, Sequence[str], None] = '6e2b7c1d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # client_id, asset_id and advisor_id lookups alone are already served by the
+    # leading columns of the keyset pagination indexes (d0fa4f1646f4).
+    op.create_index('ix_allocations_client_id_asset_id', 'allocations', ['client_id', 'asset_id'], unique=False)
+    op.create_index('ix_logs_created_at', 'logs', ['created_at'], unique=False)
+    op.create_index('ix_logs_user_id_created_at', 'logs', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_logs_user_id_created_at', table_name='logs')
+    op.drop_index('ix_logs_created_at', table_name='logs')
+    op.drop_index('ix_allocations_client_id_asset_id', table_name='allocations')
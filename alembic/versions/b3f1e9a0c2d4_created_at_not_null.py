@@ -0,0 +1,44 @@
+"""created_at not null on paginated tables
+
+Revision ID: b3f1e9a0c2d4
+Revises: 1b6f8cd75bb5
+Create Date: 2026-10-18 10:05:12.730415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1e9a0c2d4'
+down_revision: Union[str, Sequence[str], None] = '1b6f8cd75bb5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# keyset pagination orders these by (created_at, id), which needs created_at on every row
+TABLES = ('clients', 'assets', 'allocations')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.execute(f'UPDATE {table} SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL')
+        op.alter_column(
+            table, 'created_at',
+            existing_type=sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text('now()'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.alter_column(
+            table, 'created_at',
+            existing_type=sa.DateTime(timezone=True),
+            nullable=True,
+            server_default=None,
+        )
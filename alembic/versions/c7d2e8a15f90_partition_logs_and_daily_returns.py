@@ -0,0 +1,121 @@
+"""Range-partition logs (monthly) and daily_returns (yearly)
+
+Revision ID: c7d2e8a15f90
+Revises: a4c91e2f7b13
+Create Date: 2026-10-18 12:31:54.807113
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e8a15f90'
+down_revision: Union[str, Sequence[str], None] = 'a4c91e2f7b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions ahead of today created here; src.tasks.partition_maintenance keeps
+# creating them from then on.
+PREMAKE = 3
+
+
+def _months(start: date, end: date):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        lo = date(year, month, 1)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        yield f"y{lo.year}m{lo.month:02d}", lo, date(year, month, 1)
+
+
+def _years(start: date, end: date):
+    for year in range(start.year, end.year + 1):
+        yield f"y{year}", date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def _partition(table: str, column: str, constraints: list[tuple[str, str]], indexes: list[str], periods) -> None:
+    """Swap `table` for a partitioned copy, one partition per period plus a default, and move the rows over."""
+    conn = op.get_bind()
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey")
+    for index in indexes:
+        op.execute(f"DROP INDEX IF EXISTS {index.split()[0]}")
+    for name, _ in constraints:
+        op.execute(f"ALTER TABLE {table}_old DROP CONSTRAINT IF EXISTS {name}")
+
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE ({column})"
+    )
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {column})")
+    for name, definition in constraints:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+    for index in indexes:
+        op.execute(f"CREATE INDEX {index.split()[0]} ON {table} {index.split(maxsplit=1)[1]}")
+
+    first = conn.execute(sa.text(f"SELECT min({column})::date FROM {table}_old")).scalar() or date.today()
+    for suffix, lo, hi in periods(first):
+        op.execute(f"CREATE TABLE {table}_{suffix} PARTITION OF {table} FOR VALUES FROM ('{lo}') TO ('{hi}')")
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+    op.execute(f"DROP TABLE {table}_old")
+
+
+def _unpartition(table: str, constraints: list[tuple[str, str]], indexes: list[str]) -> None:
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+    op.execute(f"ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey")
+    for index in indexes:
+        op.execute(f"DROP INDEX IF EXISTS {index.split()[0]}")
+    for name, _ in constraints:
+        op.execute(f"ALTER TABLE {table}_partitioned DROP CONSTRAINT IF EXISTS {name}")
+
+    op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+    for name, definition in constraints:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+    for index in indexes:
+        op.execute(f"CREATE INDEX {index.split()[0]} ON {table} {index.split(maxsplit=1)[1]}")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+    op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+
+
+DAILY_RETURNS_CONSTRAINTS = [
+    ("uq_asset_date", "UNIQUE (asset_id, date)"),
+    ("daily_returns_asset_id_fkey", "FOREIGN KEY (asset_id) REFERENCES assets (id) ON DELETE CASCADE"),
+]
+
+LOGS_CONSTRAINTS = [
+    ("logs_user_id_fkey", "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE SET NULL"),
+]
+
+LOGS_INDEXES = [
+    "ix_logs_created_at (created_at)",
+    "ix_logs_user_id_created_at (user_id, created_at)",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    today = date.today()
+    ahead = date(today.year + 1, 1, 1)
+    month_ahead = date(today.year + (today.month + PREMAKE - 1) // 12, (today.month + PREMAKE - 1) % 12 + 1, 1)
+
+    _partition(
+        "daily_returns", "date", DAILY_RETURNS_CONSTRAINTS, [],
+        lambda first: _years(first, ahead),
+    )
+    _partition(
+        "logs", "created_at", LOGS_CONSTRAINTS, LOGS_INDEXES,
+        lambda first: _months(min(first, today), month_ahead),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _unpartition("logs", LOGS_CONSTRAINTS, LOGS_INDEXES)
+    _unpartition("daily_returns", DAILY_RETURNS_CONSTRAINTS, [])
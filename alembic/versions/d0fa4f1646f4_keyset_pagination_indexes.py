@@ -0,0 +1,39 @@
+"""Keyset pagination indexes
+
+Revision ID: d0fa4f1646f4
+Revises: b3f1e9a0c2d4
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0fa4f1646f4'
+down_revision: Union[str, Sequence[str], None] = 'b3f1e9a0c2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_clients_created_at_id', 'clients', ['created_at', 'id'], unique=False)
+    op.create_index('ix_clients_advisor_id_created_at_id', 'clients', ['advisor_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_assets_created_at_id', 'assets', ['created_at', 'id'], unique=False)
+    op.create_index('ix_assets_asset_type_created_at_id', 'assets', ['asset_type', 'created_at', 'id'], unique=False)
+    op.create_index('ix_allocations_created_at_id', 'allocations', ['created_at', 'id'], unique=False)
+    op.create_index('ix_allocations_client_id_created_at_id', 'allocations', ['client_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_allocations_asset_id_created_at_id', 'allocations', ['asset_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_allocations_asset_id_created_at_id', table_name='allocations')
+    op.drop_index('ix_allocations_client_id_created_at_id', table_name='allocations')
+    op.drop_index('ix_allocations_created_at_id', table_name='allocations')
+    op.drop_index('ix_assets_asset_type_created_at_id', table_name='assets')
+    op.drop_index('ix_assets_created_at_id', table_name='assets')
+    op.drop_index('ix_clients_advisor_id_created_at_id', table_name='clients')
+    op.drop_index('ix_clients_created_at_id', table_name='clients')
@@ -0,0 +1,87 @@
+"""
+
+Benchmark: vectorized analytics vs a row-by-row Python baseline.
+
+Runs offline on a synthetic (days x assets) price matrix; no database needed.
+
+usage:
+    python -m benchmarks.bench_analytics --days 2520 --assets 100
+
+"""
+
+import argparse
+import math
+import time
+import numpy as np
+from src.services import analytics_service as analytics
+
+
+def _python_baseline(prices: list[list[float]], benchmark: list[float]):
+    # what a naive implementation over ORM rows would do, one value at a time
+    n_days, n_assets = len(prices), len(prices[0])
+    bench_returns = [benchmark[i] / benchmark[i - 1] - 1 for i in range(1, n_days)]
+    returns = [[prices[i][j] / prices[i - 1][j] - 1 for j in range(n_assets)] for i in range(1, n_days)]
+
+    stats = []
+    for j in range(n_assets):
+        column = [row[j] for row in returns]
+        mean = sum(column) / len(column)
+        vol = math.sqrt(sum((r - mean) ** 2 for r in column) / (len(column) - 1)) * math.sqrt(252)
+
+        peak, worst = prices[0][j], 0.0
+        for i in range(n_days):
+            peak = max(peak, prices[i][j])
+            worst = min(worst, prices[i][j] / peak - 1)
+
+        b_mean = sum(bench_returns) / len(bench_returns)
+        cov = sum((r - mean) * (b - b_mean) for r, b in zip(column, bench_returns))
+        var = sum((b - b_mean) ** 2 for b in bench_returns)
+        stats.append((vol, worst, cov / var))
+
+    corr = [[0.0] * n_assets for _ in range(n_assets)]
+    means = [sum(row[j] for row in returns) / len(returns) for j in range(n_assets)]
+    for a in range(n_assets):
+        for b in range(a, n_assets):
+            num = sum((row[a] - means[a]) * (row[b] - means[b]) for row in returns)
+            den_a = sum((row[a] - means[a]) ** 2 for row in returns)
+            den_b = sum((row[b] - means[b]) ** 2 for row in returns)
+            corr[a][b] = corr[b][a] = num / math.sqrt(den_a * den_b)
+    return stats, corr
+
+
+def _vectorized(prices: np.ndarray, benchmark: np.ndarray):
+    returns = analytics.simple_returns(prices)
+    summary = analytics.summarize(prices, analytics.simple_returns(benchmark))
+    return summary, analytics.correlation_matrix(returns)
+
+
+def main(days: int, assets: int):
+    rng = np.random.default_rng(42)
+    prices = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, (days, assets)), axis=0)
+    benchmark = 100 * np.cumprod(1 + rng.normal(0.0003, 0.01, days))
+
+    started = time.perf_counter()
+    summary, corr = _vectorized(prices, benchmark)
+    vectorized = time.perf_counter() - started
+
+    started = time.perf_counter()
+    stats, py_corr = _python_baseline(prices.tolist(), benchmark.tolist())
+    baseline = time.perf_counter() - started
+
+    assert np.allclose(summary["volatility"], [s[0] for s in stats])
+    assert np.allclose(summary["max_drawdown"], [s[1] for s in stats])
+    assert np.allclose(summary["beta"], [s[2] for s in stats])
+    assert np.allclose(corr, py_corr)
+
+    print(f"{days} days x {assets} assets")
+    print(f"python     {baseline:>9.3f}s")
+    print(f"numpy      {vectorized:>9.3f}s")
+    print(f"speedup: {baseline / vectorized:.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--assets", type=int, default=100)
+    args = parser.parse_args()
+    main(args.days, args.assets)
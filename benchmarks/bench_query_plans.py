@@ -0,0 +1,179 @@
+"""
+
+Benchmark: EXPLAIN ANALYZE of the hot lookups with and without their indexes.
+
+Seeds advisors, clients, assets, allocations, users and logs against
+DATABASE_URL, runs each query with the indexes in place, drops them and runs
+again, all inside one transaction that is rolled back at the end, so nothing
+is persisted. DROP INDEX takes an exclusive lock on the table until the
+rollback: run it against a scratch database, not a shared one.
+
+usage:
+    python -m benchmarks.bench_query_plans --clients 20000 --allocations 200000 --logs 200000
+
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert, text
+from src.db.database import engine
+from src.db.models.core_models import (
+    Advisor,
+    Allocation,
+    Asset,
+    AssetTypeEnum,
+    Client,
+    Log,
+    LogActionEnum,
+    User,
+)
+
+CHUNK = 5000
+
+# every index that can serve the queries below
+INDEXES = [
+    "ix_allocations_client_id_asset_id",
+    "ix_allocations_client_id_created_at_id",
+    "ix_allocations_asset_id_created_at_id",
+    "ix_clients_advisor_id_created_at_id",
+    "ix_logs_created_at",
+    "ix_logs_user_id_created_at",
+]
+
+QUERIES = {
+    "allocations by client": "SELECT * FROM allocations WHERE client_id = :client_id",
+    "allocation client+asset": "SELECT * FROM allocations WHERE client_id = :client_id AND asset_id = :asset_id",
+    "allocations by asset": "SELECT * FROM allocations WHERE asset_id = :asset_id",
+    "clients by advisor": "SELECT * FROM clients WHERE advisor_id = :advisor_id",
+    "recent logs": "SELECT * FROM logs WHERE created_at >= :since ORDER BY created_at DESC LIMIT 100",
+    "logs by user": "SELECT * FROM logs WHERE user_id = :user_id ORDER BY created_at DESC LIMIT 100",
+}
+
+
+async def _insert(conn, model, rows: list[dict]):
+    for start in range(0, len(rows), CHUNK):
+        await conn.execute(insert(model), rows[start:start + CHUNK])
+
+
+async def _seed(conn, args) -> dict:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    tag = uuid.uuid4().hex[:8]
+
+    advisors = [
+        {"id": uuid.uuid4(), "name": f"Bench {i}", "email": f"bench-{tag}-{i}@example.com"}
+        for i in range(args.advisors)
+    ]
+    clients = [
+        {"id": uuid.uuid4(), "name": f"Bench {i}", "advisor_id": rng.choice(advisors)["id"], "created_at": now}
+        for i in range(args.clients)
+    ]
+    assets = [
+        {"id": uuid.uuid4(), "ticker": f"BQ{tag}{i:05d}", "name": f"Bench {i}", "asset_type": AssetTypeEnum.ACAO}
+        for i in range(args.assets)
+    ]
+    allocations = [
+        {
+            "id": uuid.uuid4(),
+            "client_id": rng.choice(clients)["id"],
+            "asset_id": rng.choice(assets)["id"],
+            "quantity": 1,
+            "avg_price": 10,
+            "invested_amount": 10,
+            "created_at": now,
+        }
+        for _ in range(args.allocations)
+    ]
+    users = [
+        {"id": uuid.uuid4(), "username": f"bench-{tag}-{i}", "email": f"bench-{tag}-{i}@example.com", "hashed_password": "x"}
+        for i in range(args.users)
+    ]
+    logs = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": rng.choice(users)["id"],
+            "action": LogActionEnum.ACCESS,
+            "entity": "clients",
+            "created_at": now - timedelta(minutes=rng.randrange(60 * 24 * 365)),
+        }
+        for _ in range(args.logs)
+    ]
+
+    for model, rows in (
+        (Advisor, advisors), (Client, clients), (Asset, assets),
+        (Allocation, allocations), (User, users), (Log, logs),
+    ):
+        await _insert(conn, model, rows)
+        print(f"seeded {len(rows):>8} {model.__tablename__}")
+    await conn.execute(text("ANALYZE advisors, clients, assets, allocations, users, logs"))
+
+    sample = rng.choice(allocations)
+    return {
+        "client_id": sample["client_id"],
+        "asset_id": sample["asset_id"],
+        "advisor_id": rng.choice(advisors)["id"],
+        "user_id": rng.choice(users)["id"],
+        "since": now - timedelta(days=1),
+    }
+
+
+def _scans(plan: dict) -> list[str]:
+    children = plan.get("Plans", [])
+    if not children:
+        index = plan.get("Index Name")
+        return [f"{plan['Node Type']} ({index})" if index else plan["Node Type"]]
+    return [scan for child in children for scan in _scans(child)]
+
+
+async def _explain(conn, sql: str, params: dict, repeat: int) -> tuple[float, str]:
+    timings, scans = [], ""
+    for _ in range(repeat):
+        result = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params)
+        data = result.scalar()
+        if isinstance(data, str):
+            data = json.loads(data)
+        timings.append(data[0]["Execution Time"])
+        scans = ", ".join(_scans(data[0]["Plan"]))
+    return statistics.median(timings), scans
+
+
+async def _run_all(conn, params: dict, repeat: int) -> dict[str, tuple[float, str]]:
+    return {name: await _explain(conn, sql, params, repeat) for name, sql in QUERIES.items()}
+
+
+async def main(args):
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            params = await _seed(conn, args)
+            with_indexes = await _run_all(conn, params, args.repeat)
+            for index in INDEXES:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            without_indexes = await _run_all(conn, params, args.repeat)
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+    print(f"\n{'query':<26} {'no index ms':>12} {'indexed ms':>11} {'speedup':>8}  plan (indexed | no index)")
+    for name in QUERIES:
+        before, before_plan = without_indexes[name]
+        after, after_plan = with_indexes[name]
+        speedup = before / after if after else float("inf")
+        print(f"{name:<26} {before:>12.3f} {after:>11.3f} {speedup:>7.1f}x  {after_plan} | {before_plan}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--advisors", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=20000)
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--allocations", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logs", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
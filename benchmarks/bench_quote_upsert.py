@@ -0,0 +1,76 @@
+"""
+
+Benchmark: per-row vs bulk PriceQuote upsert.
+
+Runs both write paths against DATABASE_URL with synthetic tickers inside a
+transaction that is rolled back at the end, so nothing is persisted.
+
+usage:
+    python -m benchmarks.bench_quote_upsert --rows 5000
+
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.database import async_session, engine
+from src.db.models.core_models import PriceQuote
+from src.services.price_service import upsert_quotes
+
+
+def _synthetic_quotes(rows: int) -> dict[str, tuple[float, float]]:
+    rng = random.Random(42)
+    return {
+        f"BENCH{i:06d}": (round(rng.uniform(1, 500), 4), round(rng.uniform(1, 500), 4))
+        for i in range(rows)
+    }
+
+
+async def _per_row_upsert(session: AsyncSession, quotes: dict[str, tuple[float, float]]):
+    # Previous write path: one INSERT ... ON CONFLICT round trip per ticker.
+    for symbol, (price, prev) in quotes.items():
+        now = datetime.now(timezone.utc)
+        stmt = insert(PriceQuote).values(
+            ticker=symbol, price=price, prev_close=prev, updated_at=now
+        ).on_conflict_do_update(
+            index_elements=["ticker"],
+            set_={"price": price, "prev_close": prev, "updated_at": now},
+        )
+        await session.execute(stmt)
+
+
+async def _time(label: str, fn, session: AsyncSession, quotes) -> float:
+    started = time.perf_counter()
+    await fn(session, quotes)
+    await session.flush()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<10} {len(quotes):>8} rows {elapsed:>9.3f}s {len(quotes) / elapsed:>12.0f} rows/s")
+    return elapsed
+
+
+async def main(rows: int):
+    quotes = _synthetic_quotes(rows)
+    async with async_session() as session:
+        try:
+            # insert pass (new rows) and update pass (conflicting rows) for each path
+            per_row = await _time("per-row", _per_row_upsert, session, quotes)
+            await _time("per-row", _per_row_upsert, session, quotes)
+            await session.rollback()
+
+            bulk = await _time("bulk", upsert_quotes, session, quotes)
+            await _time("bulk", upsert_quotes, session, quotes)
+        finally:
+            await session.rollback()
+    await engine.dispose()
+    print(f"speedup: {per_row / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows))
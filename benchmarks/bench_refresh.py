@@ -0,0 +1,114 @@
+"""
+
+Benchmark: refresh_quotes throughput (tickers/sec) against the offline
+FakeProvider.
+
+Seeds --assets tagged assets into DATABASE_URL, swaps the market data
+provider for a FakeProvider (--latency-ms per download, --error-rate failed
+downloads) and runs the full refresh (distinct tickers, quote cache, batched
+downloads, upsert) --runs times, printing each run's summary. The first run
+is cold for the seeded tickers; later ones show the cache. Assets already in
+the database are refreshed too and count towards tickers/sec. Seeded rows are
+deleted at the end; Redis is optional.
+
+--fetch-only skips the database and times fetch_quotes for --assets
+synthetic tickers, to tune REFRESH_BATCH_SIZE / REFRESH_MAX_CONCURRENCY
+(--batch-size, --concurrency) without Postgres.
+
+usage:
+    python -m benchmarks.bench_refresh --assets 5000 --latency-ms 200 --runs 2
+    python -m benchmarks.bench_refresh --fetch-only --assets 5000 --batch-size 50 --concurrency 8
+
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from sqlalchemy import delete, insert
+from src.db.database import async_session
+from src.db.models.core_models import Asset, AssetTypeEnum, PriceQuote
+from src.services import market_data, price_service
+from src.services.market_data import FakeProvider
+from src.tasks.refresh_quotes import _refresh_quotes_async
+
+
+async def seed(n: int) -> list[str]:
+    tag = uuid.uuid4().hex[:6].upper()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "ticker": f"R{tag}{i:05d}.SA",
+            "name": f"Refresh {tag} {i}",
+            "asset_type": AssetTypeEnum.ACAO,
+            "exchange": "SAO",
+        }
+        for i in range(n)
+    ]
+    async with async_session() as session:
+        await session.execute(insert(Asset), rows)
+        await session.commit()
+    return [row["ticker"] for row in rows]
+
+
+async def cleanup(tickers: list[str]):
+    async with async_session() as session:
+        await session.execute(delete(PriceQuote).where(PriceQuote.ticker.in_(tickers)))
+        await session.execute(delete(Asset).where(Asset.ticker.in_(tickers)))
+        await session.commit()
+
+
+async def fetch_only(args, provider: FakeProvider):
+    tickers = [f"F{i:05d}.SA" for i in range(args.assets)]
+    started = time.perf_counter()
+    quotes = await price_service.fetch_quotes(tickers)
+    elapsed = time.perf_counter() - started
+    print(
+        f"fetch_quotes: {len(quotes)}/{len(tickers)} tickers, {provider.calls} downloads "
+        f"in {elapsed:.2f}s - {len(tickers) / elapsed:.1f} tickers/s"
+    )
+
+
+async def full_refresh(args, provider: FakeProvider):
+    tickers = await seed(args.assets)
+    print(f"seeded {len(tickers)} assets")
+    try:
+        for run in range(1, args.runs + 1):
+            provider.calls = 0
+            summary = await _refresh_quotes_async()
+            print(
+                f"run {run}: {summary['tickers']} tickers ({summary['cached']} cached, "
+                f"{summary['fetched']} fetched, {summary['failed']} failed), {provider.calls} downloads "
+                f"in {summary['elapsed_sec']:.2f}s - {summary['tickers_per_sec']:.1f} tickers/s"
+            )
+    finally:
+        await cleanup(tickers)
+
+
+async def main(args):
+    if args.batch_size:
+        price_service.BATCH_SIZE = args.batch_size
+    if args.concurrency:
+        price_service.MAX_CONCURRENCY = args.concurrency
+    provider = FakeProvider(latency_ms=args.latency_ms, error_rate=args.error_rate, seed=42)
+    market_data.set_provider(provider)
+    print(
+        f"batch size {price_service.BATCH_SIZE}, concurrency {price_service.MAX_CONCURRENCY}, "
+        f"latency {args.latency_ms}ms, error rate {args.error_rate:.0%}"
+    )
+    if args.fetch_only:
+        await fetch_only(args, provider)
+    else:
+        await full_refresh(args, provider)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=200, help="fake upstream latency per download")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--fetch-only", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""
+
+Benchmark: API process startup.
+
+Imports src.main in fresh interpreters (what every uvicorn worker spawn and
+test session pays) and reports the median/max wall time, plus whether heavy
+modules were pulled in at import. With --lifespan it also runs the app's
+startup/shutdown once against DATABASE_URL/REDIS_URL. Exits non-zero when
+the median import time exceeds --max-import-sec or a lazy module was
+imported eagerly, so it can guard CI.
+
+usage:
+    python -m benchmarks.bench_startup [--runs 5] [--max-import-sec 3] [--lifespan]
+
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# must not be imported by `import src.main`
+LAZY_MODULES = ("yfinance", "pandas", "qrcode", "art")
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import src.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"elapsed": elapsed, "eager": [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _import_once() -> dict:
+    out = subprocess.run([sys.executable, "-c", PROBE], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+async def _lifespan_once() -> float:
+    from src.main import app
+
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter() - started
+    return ready
+
+
+def main(args) -> int:
+    runs = [_import_once() for _ in range(args.runs)]
+    timings = [r["elapsed"] for r in runs]
+    eager = sorted({m for r in runs for m in r["eager"]})
+    median = statistics.median(timings)
+
+    print(f"import src.main   median {median:.3f}s   max {max(timings):.3f}s   ({args.runs} runs)")
+    print(f"eager heavy modules: {', '.join(eager) or 'none'}")
+
+    if args.lifespan:
+        print(f"lifespan startup  {asyncio.run(_lifespan_once()):.3f}s")
+
+    if median > args.max_import_sec or eager:
+        print("FAIL: startup regression")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-sec", type=float, default=3.0)
+    parser.add_argument("--lifespan", action="store_true")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,282 @@
+"""
+
+Load test: latency percentiles and throughput of the REST API.
+
+Seeds DATABASE_URL with advisors, clients, assets, allocations and daily
+returns (tagged so they are deleted again at the end), starts the app's
+lifespan in-process and drives /clientes, /ativos, /alocacoes, /tickers and
+/dailyReturns with --concurrency workers over httpx.ASGITransport for
+--duration seconds. Yahoo is replaced by the FakeProvider market data
+stand-in (deterministic quotes and search results, --provider-latency-ms per
+call), so runs are repeatable and offline. Redis is optional: without it the quote cache just misses.
+
+Reports count, errors, p50/p95/p99/max per scenario and overall req/s, and
+exits non-zero when a threshold is exceeded (--max-p99-ms, --max-error-rate,
+--min-rps) or, with --baseline, when a scenario's p99 regresses by more than
+--tolerance against a previous --output file.
+
+usage:
+    python -m benchmarks.load_test --concurrency 32 --duration 30 --output load.json
+    python -m benchmarks.load_test --baseline load.json --tolerance 0.2
+
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+import httpx
+import numpy as np
+from sqlalchemy import delete, insert
+from src.db.database import async_session
+from src.db.models.core_models import (
+    Advisor,
+    Allocation,
+    Asset,
+    AssetTypeEnum,
+    Client,
+    DailyReturn,
+    PriceQuote,
+)
+from src.services import market_data
+from src.services.market_data import FakeProvider
+
+CHUNK = 5000
+
+
+# -- market data stand-in ---------------------------------------------------
+
+def install_stand_ins(args):
+    market_data.set_provider(FakeProvider(latency_ms=args.provider_latency_ms, error_rate=args.provider_error_rate))
+
+
+# -- seed data ---------------------------------------------------------------
+
+async def _insert(session, model, rows: list[dict]):
+    for start in range(0, len(rows), CHUNK):
+        await session.execute(insert(model), rows[start:start + CHUNK])
+
+
+async def seed(args) -> dict:
+    rng = random.Random(42)
+    tag = uuid.uuid4().hex[:6].upper()
+    today = date.today()
+
+    advisors = [{"id": uuid.uuid4(), "name": f"Load {i}", "email": f"load-{tag}-{i}@example.com"} for i in range(50)]
+    clients = [
+        {"id": uuid.uuid4(), "name": f"Load {tag} {i}", "advisor_id": rng.choice(advisors)["id"]}
+        for i in range(args.clients)
+    ]
+    assets = [
+        {
+            "id": uuid.uuid4(),
+            "ticker": f"L{tag}{i:04d}.SA",
+            "name": f"Load {tag} {i}",
+            "asset_type": rng.choice(list(AssetTypeEnum)),
+            "exchange": "SAO",
+        }
+        for i in range(args.assets)
+    ]
+    allocations = [
+        {
+            "id": uuid.uuid4(),
+            "client_id": client["id"],
+            "asset_id": asset["id"],
+            "quantity": rng.randint(1, 1000),
+            "avg_price": round(rng.uniform(5, 200), 2),
+            "invested_amount": round(rng.uniform(100, 100000), 2),
+        }
+        for client in clients
+        for asset in rng.sample(assets, min(args.positions, len(assets)))
+    ]
+    daily_returns = []
+    for asset in assets:
+        close = rng.uniform(5, 200)
+        for d in range(args.days, 0, -1):
+            close *= 1 + rng.gauss(0, 0.02)
+            daily_returns.append({
+                "id": uuid.uuid4(), "asset_id": asset["id"], "date": today - timedelta(days=d),
+                "close": round(close, 6), "adjusted_close": round(close, 6),
+            })
+
+    async with async_session() as session:
+        for model, rows in (
+            (Advisor, advisors), (Client, clients), (Asset, assets),
+            (Allocation, allocations), (DailyReturn, daily_returns),
+        ):
+            await _insert(session, model, rows)
+            print(f"seeded {len(rows):>8} {model.__tablename__}")
+        await session.commit()
+
+    return {
+        "tag": tag,
+        "advisors": [a["id"] for a in advisors],
+        "clients": [c["id"] for c in clients],
+        "assets": [(a["id"], a["ticker"]) for a in assets],
+    }
+
+
+async def cleanup(data: dict):
+    asset_ids = [asset_id for asset_id, _ in data["assets"]]
+    tickers = [ticker for _, ticker in data["assets"]]
+    async with async_session() as session:
+        await session.execute(delete(DailyReturn).where(DailyReturn.asset_id.in_(asset_ids)))
+        await session.execute(delete(Allocation).where(Allocation.asset_id.in_(asset_ids)))
+        await session.execute(delete(Client).where(Client.id.in_(data["clients"])))
+        await session.execute(delete(Asset).where(Asset.id.in_(asset_ids)))
+        await session.execute(delete(Advisor).where(Advisor.id.in_(data["advisors"])))
+        await session.execute(delete(PriceQuote).where(PriceQuote.ticker.in_(tickers)))
+        await session.commit()
+
+
+# -- scenarios ---------------------------------------------------------------
+
+def scenarios(data: dict, rng: random.Random):
+    """(name, weight, request factory) - the factory returns (method, url, json)."""
+    clients, assets = data["clients"], data["assets"]
+    return [
+        ("GET /clientes/", 10, lambda: ("GET", "/clientes/?limit=100", None)),
+        ("GET /clientes/{id}", 15, lambda: ("GET", f"/clientes/{rng.choice(clients)}", None)),
+        ("GET /clientes/{id}/portfolio", 20, lambda: ("GET", f"/clientes/{rng.choice(clients)}/portfolio", None)),
+        ("POST /clientes/portfolios", 5, lambda: (
+            "POST", "/clientes/portfolios", {"client_ids": [str(c) for c in rng.sample(clients, min(50, len(clients)))]},
+        )),
+        ("GET /ativos/", 10, lambda: ("GET", "/ativos/?limit=100", None)),
+        ("GET /ativos/ticker/{ticker}", 10, lambda: ("GET", f"/ativos/ticker/{rng.choice(assets)[1]}", None)),
+        ("GET /alocacoes/?client_id", 10, lambda: ("GET", f"/alocacoes/?client_id={rng.choice(clients)}", None)),
+        ("GET /tickers/search", 10, lambda: ("GET", f"/tickers/search?q={rng.choice(assets)[1][:rng.randint(2, 7)]}", None)),
+        ("POST /tickers/quotes", 5, lambda: (
+            "POST", "/tickers/quotes", {"tickers": [t for _, t in rng.sample(assets, min(20, len(assets)))]},
+        )),
+        ("GET /dailyReturns/analytics/{id}", 5, lambda: ("GET", f"/dailyReturns/analytics/{rng.choice(assets)[0]}", None)),
+    ]
+
+
+async def drive(client: httpx.AsyncClient, data: dict, args) -> tuple[dict, float]:
+    rng = random.Random(7)
+    table = scenarios(data, rng)
+    names = [name for name, _, _ in table]
+    weights = [weight for _, weight, _ in table]
+    factories = {name: factory for name, _, factory in table}
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    deadline = time.perf_counter() + args.duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, url, body = factories[name]()
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies[name].append(time.perf_counter() - started)
+            errors[name] += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    for name in names:
+        samples = np.array(latencies[name]) * 1000
+        if not len(samples):
+            continue
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        results[name] = {
+            "count": len(samples),
+            "errors": errors[name],
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(samples.max()), 2),
+        }
+    return results, elapsed
+
+
+# -- report ------------------------------------------------------------------
+
+def check(results: dict, rps: float, args) -> list[str]:
+    failures = []
+    total = sum(r["count"] for r in results.values())
+    error_rate = sum(r["errors"] for r in results.values()) / total if total else 1.0
+    if error_rate > args.max_error_rate:
+        failures.append(f"error rate {error_rate:.2%} > {args.max_error_rate:.2%}")
+    if rps < args.min_rps:
+        failures.append(f"{rps:.1f} req/s < {args.min_rps}")
+    for name, r in results.items():
+        if r["p99_ms"] > args.max_p99_ms:
+            failures.append(f"{name}: p99 {r['p99_ms']}ms > {args.max_p99_ms}ms")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+        for name, r in results.items():
+            before = baseline.get(name)
+            if before and r["p99_ms"] > before["p99_ms"] * (1 + args.tolerance):
+                failures.append(f"{name}: p99 {r['p99_ms']}ms regressed from {before['p99_ms']}ms")
+    return failures
+
+
+def report(results: dict, elapsed: float) -> float:
+    total = sum(r["count"] for r in results.values())
+    rps = total / elapsed if elapsed else 0.0
+    print(f"\n{'scenario':<34} {'count':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, r in results.items():
+        print(
+            f"{name:<34} {r['count']:>7} {r['errors']:>6} {r['p50_ms']:>8.1f} "
+            f"{r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}"
+        )
+    print(f"\n{total} requests in {elapsed:.1f}s - {rps:.1f} req/s")
+    return rps
+
+
+async def main(args) -> int:
+    from src.main import app
+
+    install_stand_ins(args)
+    data = await seed(args)
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                results, elapsed = await drive(client, data, args)
+    finally:
+        await cleanup(data)
+
+    rps = report(results, elapsed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rps": rps, "scenarios": results}, f, indent=2)
+
+    failures = check(results, rps, args)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--assets", type=int, default=300)
+    parser.add_argument("--positions", type=int, default=10, help="allocations per client")
+    parser.add_argument("--days", type=int, default=250, help="daily returns per asset")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--provider-latency-ms", type=float, default=20, help="fake upstream latency per call")
+    parser.add_argument("--provider-error-rate", type=float, default=0.0)
+    parser.add_argument("--max-p99-ms", type=float, default=500)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--min-rps", type=float, default=0)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    sys.exit(asyncio.run(main(parser.parse_args())))
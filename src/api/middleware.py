@@ -0,0 +1,168 @@
+"""
+
+ASGI middlewares.
+
+Written as plain ASGI callables rather than BaseHTTPMiddleware so they add
+no extra task or body buffering per request.
+
+"""
+
+import ipaddress
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from src import metrics
+from src.config import settings
+from src.db import query_stats
+from src.db.models.core_models import LogActionEnum
+from src.services.audit_log import audit_log
+
+AUDIT_SKIP_PREFIXES = ("/docs", "/redoc", "/openapi.json", "/metrics")
+
+ACTIONS = {
+    "GET": LogActionEnum.ACCESS,
+    "HEAD": LogActionEnum.ACCESS,
+    "POST": LogActionEnum.CREATE,
+    "PUT": LogActionEnum.UPDATE,
+    "PATCH": LogActionEnum.UPDATE,
+    "DELETE": LogActionEnum.DELETE,
+}
+
+
+def _entity_id(segments: list[str]) -> uuid.UUID | None:
+    for segment in segments:
+        try:
+            return uuid.UUID(segment)
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=4)
+def _trusted_networks(spec: str) -> tuple:
+    return tuple(ipaddress.ip_network(net.strip(), strict=False) for net in spec.split(",") if net.strip())
+
+
+def _is_trusted(ip: str, networks: tuple) -> bool:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def _client_ip(scope, headers: dict[bytes, bytes]) -> str | None:
+    """
+        The peer address, or, when the peer is one of TRUSTED_PROXIES, the
+        right-most X-Forwarded-For hop that is not itself a trusted proxy
+        (hops to its left are supplied by the client and can be forged).
+    """
+    client = scope.get("client")
+    peer = client[0] if client else None
+    networks = _trusted_networks(settings.TRUSTED_PROXIES)
+    forwarded = headers.get(b"x-forwarded-for")
+    if not forwarded or peer is None or not _is_trusted(peer, networks):
+        return peer
+    hops = [hop.strip() for hop in forwarded.decode("latin-1").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, networks):
+            return hop[:45]
+    return hops[0][:45] if hops else peer
+
+
+def audit_entry(scope, status_code: int) -> dict:
+    method = scope["method"]
+    path = scope["path"]
+    segments = [s for s in path.split("/") if s]
+    headers = dict(scope.get("headers") or [])
+    user_agent = headers.get(b"user-agent")
+    action = LogActionEnum.ERROR if status_code >= 400 else ACTIONS.get(method, LogActionEnum.ACCESS)
+    return {
+        "id": uuid.uuid4(),
+        "action": action,
+        "entity": segments[0][:100] if segments else None,
+        "entity_id": _entity_id(segments),
+        "description": f"{method} {path} -> {status_code}",
+        "ip_address": _client_ip(scope, headers),
+        "user_agent": user_agent.decode("latin-1")[:255] if user_agent else None,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+class AuditMiddleware:
+    """Queues one audit entry per HTTP request on the buffered writer."""
+
+    def __init__(self, app, writer=audit_log):
+        self.app = app
+        self.writer = writer
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.AUDIT_ENABLED
+            or scope["path"] == "/"
+            or scope["path"].startswith(AUDIT_SKIP_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.writer.record(audit_entry(scope, status_code))
+
+
+def route_label(scope) -> str:
+    """Route template of a matched request (/clientes/{client_id}), "unmatched" otherwise."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # for routes of included routers scope["route"] holds the router-relative
+    # template; FastAPI records the prefixed one in the effective route context
+    effective = (scope.get("fastapi") or {}).get("effective_route_context")
+    return getattr(effective, "path_format", None) or getattr(route, "path_format", None) or route.path
+
+
+class MetricsMiddleware:
+    """Per-route latency, request count and DB time, labelled with the route template,
+    plus a Server-Timing header with the request's DB and total time."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = query_stats.begin(lambda: f"{scope['method']} {route_label(scope)}")
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    app_ms = (time.perf_counter() - started) * 1000
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", f"{stats.server_timing()}, app;dur={app_ms:.1f}".encode("latin-1")),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.observe_request(scope["method"], route_label(scope), status_code, elapsed, stats)
+            query_stats.end(token)
@@ -0,0 +1,62 @@
+"""
+
+Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by (created_at, id) and the cursor is the position of the
+last row returned, so every page is an index range scan instead of an
+OFFSET over everything before it. The cursor for the next page is returned
+in the `X-Next-Cursor` header and the body stays a plain list.
+
+"""
+
+import base64
+from datetime import datetime
+from uuid import UUID
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+
+    def __init__(
+        self,
+        cursor: str | None = Query(None, description="Value of the X-Next-Cursor header of the previous page"),
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def fetch_page(session: AsyncSession, stmt: Select, model, page: PageParams, response: Response) -> list:
+    if page.cursor:
+        created_at, id = decode_cursor(page.cursor)
+        stmt = stmt.where(
+            tuple_(model.created_at, model.id)
+            > tuple_(literal(created_at, model.created_at.type), literal(id, model.id.type))
+        )
+    stmt = stmt.order_by(model.created_at, model.id).limit(page.limit + 1)
+
+    result = await session.execute(stmt)
+    rows = result.scalars().all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
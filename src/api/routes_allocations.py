@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel, field_validator
 from typing import List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from src.db.database import get_session
+from src.api.pagination import PageParams, fetch_page
+from src.db.database import get_read_session, get_session
 from src.db.models.core_models import Allocation
 
 router = APIRouter()
@@ -31,16 +32,24 @@ class AllocationOut(AllocationBase):
         orm_type = True
 
 @router.get("/", response_model=List[AllocationOut])
-async def list_allocations(session: AsyncSession = Depends(get_session)):
+async def list_allocations(
+    response: Response,
+    client_id: UUID | None = None,
+    asset_id: UUID | None = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+):
     
     stmt = select(Allocation)
-    result = await session.execute(stmt)
-    allocations = result.scalars().all()
+    if client_id:
+        stmt = stmt.where(Allocation.client_id == client_id)
+    if asset_id:
+        stmt = stmt.where(Allocation.asset_id == asset_id)
     
-    return allocations
+    return await fetch_page(session, stmt, Allocation, page, response)
 
 @router.get("/{allocation_id}", response_model=AllocationOut)
-async def list_allocation_by_id(allocation_id,  session: AsyncSession = Depends(get_session)):
+async def list_allocation_by_id(allocation_id,  session: AsyncSession = Depends(get_read_session)):
     stmt = select(Allocation).where(Allocation.id.in_([allocation_id]))
     result = await session.execute(stmt)
     allocation = result.scalars().first()
@@ -50,7 +59,7 @@ async def list_allocation_by_id(allocation_id,  session: AsyncSession = Depends(
     return allocation
 
 @router.get("/{client_id}", response_model=List[AllocationOut])
-async def list_allocation_by_client_id(client_id,  session: AsyncSession = Depends(get_session)):
+async def list_allocation_by_client_id(client_id,  session: AsyncSession = Depends(get_read_session)):
     stmt = select(Allocation).where(Allocation.client_id.in_([client_id]))
     result = await session.execute(stmt)
     allocation = result.scalars().first()
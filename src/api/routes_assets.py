@@ -1,12 +1,15 @@
 import enum
 #import yfinance as yahoo
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
-from src.db.database import get_session
+from src.api.pagination import PageParams, fetch_page
+from src.db.database import get_read_session, get_session
+from src.db.models import core_models
 from src.db.models.core_models import Asset
+from src.services.ticker_index import ticker_index
 from sqlalchemy import select
 
 
@@ -34,14 +37,19 @@ class AssetOut(AssetBase):
         orm_mode = True
 
 @router.get("/", response_model=List[AssetOut])
-async def list_assets(session: AsyncSession = Depends(get_session)):
+async def list_assets(
+    response: Response,
+    asset_type: AssetTypeEnum | None = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+):
     stmt = select(Asset)
-    result = await session.execute(stmt)
-    assets = result.scalars().all()
-    return assets
+    if asset_type:
+        stmt = stmt.where(Asset.asset_type == core_models.AssetTypeEnum(asset_type.value))
+    return await fetch_page(session, stmt, Asset, page, response)
 
 @router.get("/{asset_id}", response_model=AssetOut)
-async def get_asset_by_id(asset_id, session: AsyncSession = Depends(get_session)):
+async def get_asset_by_id(asset_id, session: AsyncSession = Depends(get_read_session)):
     stmt = select(Asset).where(Asset.id.in_([asset_id]))
     result = await session.execute(stmt)
     asset = result.scalar().first()
@@ -52,7 +60,7 @@ async def get_asset_by_id(asset_id, session: AsyncSession = Depends(get_session)
     return asset
 
 @router.get("/ticker/{asset_ticker}", response_model=AssetOut)
-async def get_asset_by_ticker(asset_ticker, session: AsyncSession = Depends(get_session)):
+async def get_asset_by_ticker(asset_ticker, session: AsyncSession = Depends(get_read_session)):
     stmt = select(Asset).where(Asset.ticker.in_([asset_ticker]))
     result = await session.execute(stmt)
     asset = result.scalars().first()
@@ -89,6 +97,7 @@ async def create_assets(asset: AssetBase, session: AsyncSession = Depends(get_se
     session.add(new_asset)
     await session.commit()
     await session.refresh(new_asset)
+    ticker_index.add_asset(new_asset)
     
     return new_asset
 
@@ -8,17 +8,21 @@
 
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
 from typing import List
-from src.db.database import get_session
+from src.api.pagination import PageParams, fetch_page
+from src.db.database import get_read_session, get_session
 from src.db.models.core_models import Client # Go to services
+from src.services.portfolio_service import value_portfolio, value_portfolios
 
 router = APIRouter()
 
+MAX_PORTFOLIOS_PER_REQUEST = 5000
+
 
 class ClientBase(BaseModel):
     name: str
@@ -36,8 +40,42 @@ class ClientOut(ClientBase):
         orm_mode = True
 
 
+class PositionOut(BaseModel):
+    ticker: str
+    quantity: float
+    avg_price: float | None
+    invested_amount: float
+    price: float | None
+    prev_close: float | None
+    market_value: float | None
+    pnl: float | None
+    pnl_pct: float | None
+    day_change: float | None
+    weight: float | None
+
+
+class PortfolioOut(BaseModel):
+    client_id: UUID
+    market_value: float
+    invested_amount: float
+    pnl: float
+    pnl_pct: float | None
+    day_change: float
+    day_change_pct: float | None
+    positions: List[PositionOut]
+
+
+class PortfoliosRequest(BaseModel):
+    client_ids: List[UUID]
+
+
 @router.get("/", response_model=List[ClientOut])
-async def list_clients(session: AsyncSession = Depends(get_session)):
+async def list_clients(
+    response: Response,
+    advisor_id: UUID | None = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+):
     
     """
     
@@ -47,13 +85,13 @@ async def list_clients(session: AsyncSession = Depends(get_session)):
     """
     
     stmt = select(Client)
-    result = await session.execute(stmt)
-    clients = result.scalars().all()
-    return clients
+    if advisor_id:
+        stmt = stmt.where(Client.advisor_id == advisor_id)
+    return await fetch_page(session, stmt, Client, page, response)
 
 
 @router.get("/{client_id}", response_model=ClientOut)
-async def list_client_by_id(client_id, session: AsyncSession = Depends(get_session)):
+async def list_client_by_id(client_id, session: AsyncSession = Depends(get_read_session)):
     stmt = select(Client).where(Client.id.in_([client_id]))
     result = await session.execute(stmt)
     client = result.scalars().first()
@@ -62,6 +100,40 @@ async def list_client_by_id(client_id, session: AsyncSession = Depends(get_sessi
     return client
 
 
+@router.get("/{client_id}/portfolio", response_model=PortfolioOut)
+async def get_client_portfolio(client_id: UUID, session: AsyncSession = Depends(get_read_session)):
+    portfolio = await value_portfolio(session, client_id)
+    if portfolio:
+        return portfolio
+
+    client = await session.get(Client, client_id)
+    if not client:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    return PortfolioOut(
+        client_id=client_id, market_value=0, invested_amount=0, pnl=0,
+        pnl_pct=None, day_change=0, day_change_pct=None, positions=[],
+    )
+
+
+@router.post("/portfolios", response_model=List[PortfolioOut])
+async def get_clients_portfolios(body: PortfoliosRequest, session: AsyncSession = Depends(get_read_session)):
+
+    """
+        Bulk valuation for advisor dashboards: clients without allocations
+        are omitted from the response.
+    """
+
+    if len(body.client_ids) > MAX_PORTFOLIOS_PER_REQUEST:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_PORTFOLIOS_PER_REQUEST} clients per request",
+        )
+
+    portfolios = await value_portfolios(session, body.client_ids)
+    return list(portfolios.values())
+
+
 @router.post("/", response_model=ClientOut, status_code=status.HTTP_201_CREATED)
 async def create_clients(
     client: ClientBase, session: AsyncSession = Depends(get_session)
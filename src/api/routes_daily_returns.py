@@ -1,13 +1,128 @@
-from fastapi import APIRouter
+from datetime import date
+from typing import List
+from uuid import UUID
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.database import get_read_session
+from src.services import analytics_service as analytics
 
 router = APIRouter()
 
+MAX_ANALYTICS_ASSETS = 200
+
+
+class PortfolioAnalyticsRequest(BaseModel):
+    asset_ids: List[UUID]
+    weights: List[float] | None = None
+    benchmark_id: UUID | None = None
+    start: date | None = None
+    end: date | None = None
+
+
+def _floats(values) -> list[float | None]:
+    return [None if np.isnan(v) else float(v) for v in np.atleast_1d(values)]
+
+
+def _float(value) -> float | None:
+    return _floats(value)[0]
+
 
 @router.get("/")
 def list_daily_returns():
     return
 
 
+@router.get("/analytics/{asset_id}")
+async def get_asset_analytics(
+    asset_id: UUID,
+    start: date | None = None,
+    end: date | None = None,
+    benchmark_id: UUID | None = None,
+    series: bool = False,
+    session: AsyncSession = Depends(get_read_session),
+):
+    columns = list(dict.fromkeys([asset_id] if benchmark_id is None else [asset_id, benchmark_id]))
+    dates, prices = await analytics.load_price_matrix(session, columns, start, end)
+    if not len(dates):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    asset_prices = prices[:, :1]
+    benchmark = analytics.simple_returns(prices[:, columns.index(benchmark_id)]) if benchmark_id else None
+    summary = analytics.summarize(asset_prices, benchmark)
+
+    response = {
+        "asset_id": asset_id,
+        "start": str(dates[0]),
+        "end": str(dates[-1]),
+        "observations": int(np.count_nonzero(~np.isnan(asset_prices))),
+        **{name: _float(values) for name, values in summary.items()},
+    }
+    if series:
+        returns = analytics.simple_returns(asset_prices)
+        response["series"] = {
+            "dates": [str(d) for d in dates],
+            "cumulative_return": [0.0] + _floats(analytics.cumulative_returns(returns)[:, 0]),
+            "drawdown": _floats(analytics.drawdown(asset_prices)[:, 0]),
+        }
+    return response
+
+
+@router.post("/analytics/portfolio")
+async def get_portfolio_analytics(body: PortfolioAnalyticsRequest, session: AsyncSession = Depends(get_read_session)):
+
+    asset_ids = list(dict.fromkeys(body.asset_ids))
+    if not asset_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Assets are required")
+
+    if len(asset_ids) > MAX_ANALYTICS_ASSETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_ANALYTICS_ASSETS} assets per request",
+        )
+
+    if body.weights is not None and len(body.weights) != len(asset_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Weights must match assets")
+
+    weights = np.array(body.weights if body.weights is not None else [1.0] * len(asset_ids))
+    if np.isclose(weights.sum(), 0.0):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Weights must not sum to zero")
+    weights = weights / weights.sum()
+
+    # the benchmark may also be one of the assets; the matrix has one column per distinct id
+    columns = list(dict.fromkeys(asset_ids + ([body.benchmark_id] if body.benchmark_id else [])))
+    dates, prices = await analytics.load_price_matrix(session, columns, body.start, body.end)
+    if not len(dates):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    asset_prices = prices[:, :len(asset_ids)]
+    returns = analytics.simple_returns(asset_prices)
+    benchmark = analytics.simple_returns(prices[:, columns.index(body.benchmark_id)]) if body.benchmark_id else None
+    portfolio = analytics.portfolio_returns(returns, weights)
+    portfolio_prices = np.concatenate(([1.0], 1.0 + analytics.cumulative_returns(portfolio[:, None])[:, 0]))
+
+    per_asset = analytics.summarize(asset_prices, benchmark)
+    portfolio_summary = {
+        "total_return": _float(portfolio_prices[-1] - 1.0),
+        "volatility": _float(analytics.annualized_volatility(portfolio[:, None])),
+        "max_drawdown": _float(analytics.max_drawdown(portfolio_prices[:, None])),
+    }
+    if benchmark is not None:
+        portfolio_summary["beta"] = _float(analytics.beta(portfolio[:, None], benchmark))
+
+    return {
+        "start": str(dates[0]),
+        "end": str(dates[-1]),
+        "assets": [
+            {"asset_id": asset_id, "weight": float(weights[j]), **{name: _floats(values)[j] for name, values in per_asset.items()}}
+            for j, asset_id in enumerate(asset_ids)
+        ],
+        "correlation": [_floats(row) for row in analytics.correlation_matrix(returns)],
+        "portfolio": portfolio_summary,
+    }
+
+
 @router.post("/")
 def create_daily_returns():
     return
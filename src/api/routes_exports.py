@@ -0,0 +1,92 @@
+"""
+
+Streaming exports for nightly reconciliation.
+
+Rows are read through a server-side cursor (`session.stream`) in chunks of
+EXPORT_CHUNK_SIZE and written to the response as NDJSON or CSV while the
+query is still running, so memory stays flat no matter the table size.
+
+"""
+
+import csv
+import enum
+import io
+import json
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from src.config import settings
+from src.db.database import read_sessionmaker
+from src.db.models.core_models import Allocation, Asset, Client, DailyReturn
+
+router = APIRouter()
+
+
+class ExportCollection(str, enum.Enum):
+    ALLOCATIONS = "allocations"
+    CLIENTS = "clients"
+    ASSETS = "assets"
+    DAILY_RETURNS = "daily_returns"
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+TABLES = {
+    ExportCollection.ALLOCATIONS: Allocation.__table__,
+    ExportCollection.CLIENTS: Client.__table__,
+    ExportCollection.ASSETS: Asset.__table__,
+    ExportCollection.DAILY_RETURNS: DailyReturn.__table__,
+}
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _plain(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+async def _stream_rows(table):
+    async with (await read_sessionmaker())() as session:
+        stmt = select(table).execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
+
+
+async def _ndjson(table):
+    keys = table.columns.keys()
+    async for rows in _stream_rows(table):
+        yield "".join(
+            json.dumps({k: _plain(v) for k, v in zip(keys, row)}, default=str) + "\n"
+            for row in rows
+        )
+
+
+async def _csv(table):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table.columns.keys())
+    async for rows in _stream_rows(table):
+        writer.writerows([_plain(v) for v in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/{collection}")
+async def export_collection(collection: ExportCollection, format: ExportFormat = ExportFormat.NDJSON):
+    table = TABLES[collection]
+    body = _csv(table) if format == ExportFormat.CSV else _ndjson(table)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{collection.value}.{format.value}"'},
+    )
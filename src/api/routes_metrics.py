@@ -0,0 +1,37 @@
+"""
+
+Operational metrics for the running process.
+
+"""
+from fastapi import APIRouter, Response
+from src import metrics
+from src.db.database import engine, read_engine
+from src.db.pool import pool_stats
+from src.services.audit_log import audit_log
+from src.services.market_data import upstream
+
+router = APIRouter()
+
+
+@router.get('')
+async def prometheus_metrics():
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
+@router.get('/db-pool')
+async def db_pool_metrics():
+    stats = pool_stats(engine.pool)
+    if read_engine is not None:
+        stats["replica"] = pool_stats(read_engine.pool)
+    return stats
+
+
+@router.get('/audit')
+async def audit_metrics():
+    return audit_log.stats()
+
+
+@router.get('/market-data')
+async def market_data_metrics():
+    return upstream.stats()
@@ -1,43 +1,61 @@
 """
 
-yfinance router to search tickers
+Ticker search and quotes, served through the market data provider
 
 """
-from fastapi import APIRouter, Query
-import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, field_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.database import get_read_session, get_session
+from src.services.price_service import get_quotes
+from src.services import ticker_search
+from src.services.quote_cache import quote_cache
 
 router = APIRouter()
 
-YF_SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
-
-headers = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    ),
-    "Accept": "application/json, text/javascript, */*; q=0.01",
-    "Accept-Language": "en-US,en;q=0.9",
-    "Referer": "https://finance.yahoo.com/",
-}
+MAX_BATCH_QUOTES = 500
 
 @router.get('/search')
-async def search_ticker(q: str = Query(..., min_length=1), quotes_count: int = 8):
-    
-    params = {"q": q, "quotes_count": quotes_count, "news_count": 0}
-    async with httpx.AsyncClient(timeout=8, headers=headers) as client:
-        r = await client.get(YF_SEARCH_URL, params=params)
-        r.raise_for_status()
-        data = r.json()
-    results = []
-    for it in data.get("quotes", [])[:quotes_count]:
-        if not it.get("symbol"):
-            continue
-        results.append({
-                "symbol":  it["symbol"],
-                "shortname": it.get("shortname"),
-                "exchDisp": it.get("exchDisp"),
-                "typeDisp": it.get("typeDisp"),
-            })
-    
-    return {"results": results}
\ No newline at end of file
+async def search_ticker(
+    q: str = Query(..., min_length=1),
+    quotes_count: int = 8,
+    session: AsyncSession = Depends(get_read_session),
+):
+    results = await ticker_search.search_tickers(q, quotes_count, session)
+    return {"results": results}
+
+
+class QuotesRequest(BaseModel):
+    tickers: list[str]
+
+    @field_validator("tickers")
+    @classmethod
+    def normalize_tickers(cls, v: list[str]) -> list[str]:
+        return [t.strip().upper() for t in v if isinstance(t, str) and t.strip()]
+
+
+@router.post('/quotes')
+async def get_quotes_batch(body: QuotesRequest, session: AsyncSession = Depends(get_session)):
+
+    if not body.tickers:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tickers are required")
+
+    if len(body.tickers) > MAX_BATCH_QUOTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_QUOTES} tickers per request",
+        )
+
+    quotes = await get_quotes(session, body.tickers)
+    return {
+        "quotes": {
+            ticker: {"price": price, "prev_close": prev}
+            for ticker, (price, prev) in quotes.items()
+        },
+        "missing": [t for t in dict.fromkeys(body.tickers) if t not in quotes],
+    }
+
+
+@router.get('/cache/stats')
+async def quote_cache_stats():
+    return {"quotes": quote_cache.stats(), "search": ticker_search.stats()}
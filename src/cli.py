@@ -0,0 +1,77 @@
+"""
+
+Development CLI: prints the BetterEdge banner (ASCII art + docs QR code) and
+runs uvicorn with reload. The API itself never renders the banner unless
+STARTUP_BANNER is set, so production workers and tests start without it.
+
+usage:
+    python -m src.cli [--host 0.0.0.0] [--port 8000] [--no-reload] [--no-banner]
+
+"""
+
+import argparse
+import io
+import os
+from colorama import Back, Fore, Style
+from src.config import settings
+
+
+def render_banner(docs_url: str) -> list[str]:
+    import qrcode
+    from art import text2art
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=1,
+    )
+    qr.add_data(docs_url)
+    qr.make(fit=True)
+    qr_ascii_io = io.StringIO()
+    qr.print_ascii(out=qr_ascii_io, invert=False)  # invert=True deixa preto no branco
+
+    qr_lines = qr_ascii_io.getvalue().splitlines()
+    art_lines = text2art("Better Edge \n Investing", font="random-medium").splitlines()
+
+    max_lines = max(len(qr_lines), len(art_lines))
+    qr_lines += [" " * len(qr_lines[0])] * (max_lines - len(qr_lines))
+    art_lines += [""] * (max_lines - len(art_lines))
+
+    return [
+        Fore.CYAN + qr_lines[i].ljust(len(qr_lines[0]) + 4) + art_lines[i] + Style.RESET_ALL
+        for i in range(max_lines)
+    ]
+
+
+def print_banner(host: str = "localhost", port: int = 8000):
+    base_url = f"http://{host}:{port}"
+    docs_url = f"{base_url}/docs"
+    if not settings.DEBUGGING:
+        os.system('cls' if os.name == 'nt' else 'clear')
+    print("\n".join(render_banner(docs_url)))
+    print(Fore.CYAN + "Made with " + Back.CYAN + Fore.BLACK + "FastAPI, Postgres, Redis, Celery, SQLAlchemy, Uvicorn, Alembic and pytest" + Style.RESET_ALL)
+    print(" ")
+    print(Fore.CYAN + "Running on: " + base_url)
+    print(Fore.CYAN + "Docs: " + docs_url + Style.RESET_ALL)
+    print(" ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--no-reload", action="store_true")
+    parser.add_argument("--no-banner", action="store_true")
+    args = parser.parse_args()
+
+    if not args.no_banner:
+        print_banner("localhost" if args.host == "0.0.0.0" else args.host, args.port)
+
+    import uvicorn
+
+    uvicorn.run("src.main:app", host=args.host, port=args.port, reload=not args.no_reload)
+
+
+if __name__ == "__main__":
+    main()
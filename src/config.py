@@ -6,8 +6,68 @@ load_dotenv()
 
 class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DATABASE_READ_URL: str | None = os.getenv("DATABASE_READ_URL")
+    READ_REPLICA_MAX_LAG_SEC: float = 5
+    READ_REPLICA_CHECK_INTERVAL_SEC: float = 5
     REDIS_URL: str = os.getenv("REDIS_URL")
     YF_CACHE_TTL_SEC: int = 3600 
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SEC: float = 30
+    DB_POOL_RECYCLE_SEC: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # 0 when running behind pgbouncer (transaction mode)
+    REFRESH_BATCH_SIZE: int = 100
+    REFRESH_MAX_CONCURRENCY: int = 4
+    REFRESH_TIMEOUT_SEC: float = 240  # below the 5 min beat interval
+    REFRESH_SHARDS: int = 4  # 1 refreshes everything in a single task
+    REFRESH_SHARD_STAGGER_SEC: float = 2  # countdown between shard starts
+    QUOTE_UPSERT_CHUNK_SIZE: int = 1000
+    QUOTE_LOCAL_TTL_SEC: int = 15
+    QUOTE_LOCAL_MAXSIZE: int = 10000
+    QUOTE_REDIS_TTL_SEC: int | None = None  # defaults to YF_CACHE_TTL_SEC
+    QUOTE_STALE_WHILE_REVALIDATE: bool = True
+    QUOTE_MAX_STALE_SEC: int = 86400
+    QUOTE_LOCK_TTL_SEC: int = 30
+    QUOTE_LOCK_WAIT_SEC: float = 10
+    MARKET_DATA_PROVIDER: str = "yahoo"  # or "fake": deterministic offline quotes
+    FAKE_PROVIDER_LATENCY_MS: float = 50
+    FAKE_PROVIDER_ERROR_RATE: float = 0.0
+    MARKET_DATA_MAX_WORKERS: int = 8  # threads running blocking provider calls
+    MARKET_DATA_MAX_PENDING: int = 64  # running + queued calls before new ones are rejected
+    MARKET_DATA_TIMEOUT_SEC: float = 10  # single quote
+    MARKET_DATA_BATCH_TIMEOUT_SEC: float = 120  # batch quotes / history
+    BACKFILL_YEARS: int = 5
+    BACKFILL_BATCH_SIZE: int = 50
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+    EXPORT_CHUNK_SIZE: int = 1000
+    HTTP_TIMEOUT_SEC: float = 8
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SEC: float = 30
+    HTTP2_ENABLED: bool = True
+    SEARCH_LOCAL_TTL_SEC: int = 300
+    SEARCH_REDIS_TTL_SEC: int = 3600
+    SEARCH_CACHE_MAXSIZE: int = 5000
+    AUDIT_ENABLED: bool = True
+    TRUSTED_PROXIES: str = ""  # comma-separated IPs/CIDRs whose X-Forwarded-For is honoured
+    AUDIT_QUEUE_MAXSIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SEC: float = 1.0
+    PARTITION_PREMAKE_MONTHS: int = 3
+    PARTITION_PREMAKE_YEARS: int = 1
+    LOGS_RETENTION_MONTHS: int = 12
+    DAILY_RETURNS_RETENTION_YEARS: int | None = None  # keep all history
+    PARTITION_ARCHIVE_SCHEMA: str | None = "archive"  # empty (PARTITION_ARCHIVE_SCHEMA=) drops expired partitions
+    CELERY_METRICS_PORT: int | None = 9808
+    SLOW_QUERY_MS: float = 200
+    N_PLUS_ONE_DETECTION: bool | None = None  # defaults to DEBUGGING
+    N_PLUS_ONE_THRESHOLD: int = 10
+    SERVER_TIMING_ENABLED: bool = True
+    SQL_ECHO: bool = False
+    STARTUP_BANNER: bool = False
+    DB_POOL_PREWARM: int = 5
     DEBUGGING: bool = os.getenv("")
 
 settings = Settings()
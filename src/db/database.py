@@ -1,11 +1,55 @@
+import asyncio
+import logging
+import time
 from typing import AsyncGenerator
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
 from src.config import settings
+from src.db import query_stats
+from src.db.pool import InstrumentedQueuePool
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+logger = logging.getLogger("betteredge.db")
+
+# 0 while the replica has replayed everything it received, otherwise seconds
+# since the last replayed commit; NULL on a primary.
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def _connect_args(url: str) -> dict:
+    if make_url(url).get_driver_name() != "asyncpg":
+        return {}
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+def build_engine(url: str):
+    engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+        pool_recycle=settings.DB_POOL_RECYCLE_SEC,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(url),
+    )
+    query_stats.instrument(engine)
+    return engine
+
+
+engine = build_engine(DATABASE_URL)
 async_session = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -14,6 +58,71 @@ async_session = sessionmaker(
     expire_on_commit=False,
 )
 
+read_engine = build_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+async_read_session = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+) if read_engine is not None else async_session
+
+async def prewarm_pool(engine, connections: int) -> int:
+    """Open up to `connections` pooled connections at once so the first requests don't pay for the connect."""
+    connections = max(1, min(connections, engine.pool.size()))
+
+    async def _touch():
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await barrier.wait()
+        except Exception:
+            await barrier.abort()
+            raise
+
+    # hold every connection until all are open, otherwise the pool would keep reusing the first one
+    barrier = asyncio.Barrier(connections)
+    await asyncio.gather(*(_touch() for _ in range(connections)))
+    return connections
+
+
+_replica = {"checked_at": float("-inf"), "fresh": False}
+
+
+async def _replica_is_fresh() -> bool:
+    """Replica lag check, cached for READ_REPLICA_CHECK_INTERVAL_SEC; any error counts as stale."""
+    now = time.monotonic()
+    if now - _replica["checked_at"] < settings.READ_REPLICA_CHECK_INTERVAL_SEC:
+        return _replica["fresh"]
+    _replica["checked_at"] = now
+
+    try:
+        async with read_engine.connect() as conn:
+            lag = (await conn.execute(REPLICA_LAG_SQL)).scalar()
+    except (SQLAlchemyError, OSError) as e:
+        logger.warning("Erro ao verificar atraso da réplica, usando primário: %s", e)
+        _replica["fresh"] = False
+        return False
+
+    fresh = lag is None or float(lag) <= settings.READ_REPLICA_MAX_LAG_SEC
+    if not fresh and _replica["fresh"]:
+        logger.warning("Réplica atrasada %.1fs, leituras voltando para o primário", float(lag))
+    _replica["fresh"] = fresh
+    return fresh
+
+
+async def read_sessionmaker() -> sessionmaker:
+    """Replica sessions when DATABASE_READ_URL is set and within READ_REPLICA_MAX_LAG_SEC, else primary."""
+    if read_engine is not None and await _replica_is_fresh():
+        return async_read_session
+    return async_session
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async with (await read_sessionmaker())() as session:
+        yield session
@@ -12,6 +12,8 @@ from sqlalchemy import (
     Date,
     UniqueConstraint,
     Text,
+    Index,
+    func,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
@@ -71,7 +73,7 @@ class Client(Base):
     phone = Column(String, nullable=True)
     advisor_id = Column(UUID(as_uuid=True), nullable=True)
     risk_profile = Column(String(20), nullable=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     advisor_id = Column(
         UUID(as_uuid=True),
@@ -79,6 +81,11 @@ class Client(Base):
         nullable=True,
     )
 
+    __table_args__ = (
+        Index("ix_clients_created_at_id", "created_at", "id"),
+        Index("ix_clients_advisor_id_created_at_id", "advisor_id", "created_at", "id"),
+    )
+
 
 class Asset(Base):
     __tablename__ = "assets"
@@ -90,9 +97,16 @@ class Asset(Base):
     exchange = Column(String(50), nullable=True)
     default_fee_rate = Column(Numeric(10, 6), default=0.0)
     has_dividend = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        Index("ix_assets_created_at_id", "created_at", "id"),
+        Index("ix_assets_asset_type_created_at_id", "asset_type", "created_at", "id"),
+        Index("ix_assets_ticker_trgm", "ticker", postgresql_using="gin", postgresql_ops={"ticker": "gin_trgm_ops"}),
+        Index("ix_assets_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
 # Remember about the buy date (new input)
 # created_at it is a column there can or cannot be the buy date
 class Allocation(Base):
@@ -108,9 +122,16 @@ class Allocation(Base):
     avg_price = Column(Numeric(18, 6), nullable=False, default=0)
     invested_amount = Column(Numeric(18, 2), nullable=False, default=0)
     buy_date = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        Index("ix_allocations_created_at_id", "created_at", "id"),
+        Index("ix_allocations_client_id_created_at_id", "client_id", "created_at", "id"),
+        Index("ix_allocations_asset_id_created_at_id", "asset_id", "created_at", "id"),
+        Index("ix_allocations_client_id_asset_id", "client_id", "asset_id"),
+    )
+
 
 class DailyReturn(Base):
     __tablename__ = "daily_returns"
@@ -118,7 +139,7 @@ class DailyReturn(Base):
     asset_id = Column(
         UUID(as_uuid=True), ForeignKey("assets.id", ondelete="CASCADE"), nullable=False
     )
-    date = Column(Date, nullable=False)
+    date = Column(Date, primary_key=True, nullable=False)  # partition key, part of the PK
     open = Column(Numeric(18, 6))
     high = Column(Numeric(18, 6))
     low = Column(Numeric(18, 6))
@@ -127,7 +148,10 @@ class DailyReturn(Base):
     adjusted_close = Column(Numeric(18, 6))
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
-    __table_args__ = (UniqueConstraint("asset_id", "date", name="uq_asset_date"),)
+    __table_args__ = (
+        UniqueConstraint("asset_id", "date", name="uq_asset_date"),
+        {"postgresql_partition_by": "RANGE (date)"},  # yearly, see src.tasks.partition_maintenance
+    )
 
 
 class User(Base):
@@ -172,4 +196,10 @@ class Log(Base):
     description = Column(Text, nullable=True)  # detalhes da ação
     ip_address = Column(String(45), nullable=True)  # suporta IPv6
     user_agent = Column(String(255), nullable=True)  # navegador/app origem
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), primary_key=True, nullable=False)
+
+    __table_args__ = (
+        Index("ix_logs_created_at", "created_at"),
+        Index("ix_logs_user_id_created_at", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},  # monthly, see src.tasks.partition_maintenance
+    )
@@ -0,0 +1,66 @@
+"""
+
+Connection pool instrumentation.
+
+InstrumentedQueuePool is the engine's AsyncAdaptedQueuePool with the time
+spent acquiring a connection recorded (waiting for a free slot plus opening
+a new connection when the pool grows). pool_stats() combines that with the
+pool's own checked-out / idle / overflow counts for /metrics/db-pool.
+
+"""
+
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.reset_wait_stats()
+
+    def reset_wait_stats(self):
+        with self._stats_lock:
+            self.acquired = 0
+            self.timeouts = 0
+            self.wait_total_sec = 0.0
+            self.wait_max_sec = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        # only successful checkouts count towards acquired and the wait times
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.acquired += 1
+            self.wait_total_sec += elapsed
+            self.wait_max_sec = max(self.wait_max_sec, elapsed)
+        return connection
+
+
+def pool_stats(pool) -> dict[str, int | float]:
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        with pool._stats_lock:
+            acquired = pool.acquired
+            stats.update({
+                "acquired": acquired,
+                "timeouts": pool.timeouts,
+                "wait_avg_ms": round(pool.wait_total_sec / acquired * 1000, 3) if acquired else 0.0,
+                "wait_max_ms": round(pool.wait_max_sec * 1000, 3),
+            })
+    return stats
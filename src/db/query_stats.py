@@ -0,0 +1,113 @@
+"""
+
+Per-request SQL profiling.
+
+Cursor execute events on the engines add each statement's duration to the
+QueryStats of the current request, held in a ContextVar that the metrics
+middleware sets with begin() (SQLAlchemy runs the sync events inside the
+request's context, so the value is visible there). The middleware turns it
+into the request's DB metrics and a `Server-Timing: db;dur=...` header.
+
+Independently of requests, statements slower than SLOW_QUERY_MS are logged
+with the route that issued them, and when N+1 detection is on (defaults to
+DEBUGGING) a request that runs the same statement N_PLUS_ONE_THRESHOLD
+times or more is reported by end().
+
+"""
+
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from sqlalchemy import event
+from src.config import settings
+
+logger = logging.getLogger("betteredge.sql")
+
+MAX_LOGGED_STATEMENT = 2000
+
+
+def _detect_n_plus_one() -> bool:
+    if settings.N_PLUS_ONE_DETECTION is None:
+        return bool(settings.DEBUGGING)
+    return settings.N_PLUS_ONE_DETECTION
+
+
+class QueryStats:
+    __slots__ = ("count", "total_sec", "label", "statements")
+
+    def __init__(self, label: Callable[[], str] | None = None):
+        self.count = 0
+        self.total_sec = 0.0
+        self.label = label
+        self.statements: Counter[str] | None = Counter() if _detect_n_plus_one() else None
+
+    def route(self) -> str:
+        return self.label() if self.label else "-"
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_sec * 1000:.1f};desc="{self.count} queries"'
+
+    def repeated(self) -> list[tuple[str, int]]:
+        if not self.statements:
+            return []
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= settings.N_PLUS_ONE_THRESHOLD]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def begin(label: Callable[[], str] | None = None) -> tuple[QueryStats, Token]:
+    """Start collecting for the current request; label() names it in the logs."""
+    stats = QueryStats(label)
+    return stats, _current.set(stats)
+
+
+def end(token: Token):
+    stats = _current.get()
+    _current.reset(token)
+    if stats is None:
+        return
+    for statement, times in stats.repeated():
+        logger.warning(
+            "Possível N+1 em %s: consulta executada %d vezes: %s",
+            stats.route(), times, statement[:MAX_LOGGED_STATEMENT],
+        )
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "Consulta lenta (%.1f ms) em %s: %s",
+            elapsed * 1000, stats.route() if stats else "-", statement[:MAX_LOGGED_STATEMENT],
+        )
+
+    if stats is None:
+        return
+    stats.count += 1
+    stats.total_sec += elapsed
+    if stats.statements is not None and not executemany:
+        stats.statements[statement] += 1
+
+
+def instrument(engine):
+    """Attach the cursor events to an AsyncEngine (or a sync Engine)."""
+    target = getattr(engine, "sync_engine", engine)
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,9 @@
+import redis.asyncio as redis
+from src.config import settings
+
+redis_client = redis.from_url(
+    settings.REDIS_URL,
+    encoding="utf-8",
+    decode_responses=True,
+    socket_connect_timeout=1,
+)
@@ -0,0 +1,48 @@
+"""
+
+Console logging for the API and the dev CLI.
+
+Called from main.lifespan (and src.cli) rather than at import time, so
+importing src.main in a worker spawn or a test does no setup work.
+
+"""
+
+import logging
+import colorlog
+from src.config import settings
+
+LOG_FORMAT = "%(log_color)s%(asctime)s | %(levelname)s | %(message)s%(reset)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_COLORS = {
+    "DEBUG": "cyan",
+    "INFO": "green",
+    "WARNING": "yellow",
+    "ERROR": "red",
+    "CRITICAL": "red,bg_white",
+}
+
+_configured = False
+
+
+def configure_logging():
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(
+        colorlog.ColoredFormatter(LOG_FORMAT, datefmt=DATE_FORMAT, log_colors=LOG_COLORS)
+    )
+
+    logger = logging.getLogger("betteredge")
+    logger.setLevel(logging.INFO)
+    logger.addHandler(console_handler)
+
+    # statement logging is opt-in (SQL_ECHO); slow queries and N+1 come from betteredge.sql
+    sql_level = logging.INFO if settings.SQL_ECHO else logging.WARNING
+    for log_name in ["uvicorn", "uvicorn.access", "sqlalchemy.engine", "sqlalchemy.pool"]:
+        log = logging.getLogger(log_name)
+        log.setLevel(sql_level if log_name.startswith("sqlalchemy") else logging.INFO)
+        log.handlers.clear()
+        log.addHandler(console_handler)
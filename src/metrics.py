@@ -0,0 +1,131 @@
+"""
+
+Prometheus metrics.
+
+Request latency/counts and per-request DB time are observed by
+MetricsMiddleware, Celery task durations/failures by src.tasks.task_metrics
+(loop wait by src.tasks.runtime), and the cache, audit, upstream executor and
+connection pool counters are read from their stats() at scrape time by
+StatsCollector. The API serves them on GET /metrics; the Celery worker on
+CELERY_METRICS_PORT. With several processes
+per container set PROMETHEUS_MULTIPROC_DIR so the samples are aggregated.
+
+"""
+
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+from src.db.database import engine, read_engine
+from src.db.pool import pool_stats
+from src.db.query_stats import QueryStats
+from src.services import ticker_search
+from src.services.audit_log import audit_log
+from src.services.market_data import upstream
+from src.services.quote_cache import quote_cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_LATENCY = Histogram(
+    "betteredge_http_request_duration_seconds", "HTTP request latency", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter("betteredge_http_requests_total", "HTTP requests", ["method", "route", "status"])
+REQUEST_DB_TIME = Histogram(
+    "betteredge_http_request_db_seconds", "Database time per HTTP request", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "betteredge_http_request_db_queries", "Database queries per HTTP request", ["method", "route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+
+TASK_DURATION = Histogram(
+    "betteredge_celery_task_duration_seconds", "Celery task duration", ["task"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600),
+)
+TASKS = Counter("betteredge_celery_tasks_total", "Celery tasks finished", ["task", "state"])
+TASK_FAILURES = Counter("betteredge_celery_task_failures_total", "Celery task failures", ["task"])
+TASK_LOOP_WAIT = Histogram(
+    "betteredge_celery_task_loop_wait_seconds", "Time from submission to start on the worker loop", ["task"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+REFRESH_LAST = Gauge("betteredge_refresh_quotes_last", "Summary of the last refresh_quotes run", ["field"])
+REFRESH_SHARD_SECONDS = Gauge(
+    "betteredge_refresh_quotes_shard_seconds", "Duration of the last run of each refresh_quotes shard", ["shard"],
+)
+
+
+def observe_request(method: str, route: str, status: int, elapsed: float, stats: QueryStats):
+    REQUEST_LATENCY.labels(method, route).observe(elapsed)
+    REQUESTS.labels(method, route, str(status)).inc()
+    REQUEST_DB_TIME.labels(method, route).observe(stats.total_sec)
+    REQUEST_DB_QUERIES.labels(method, route).observe(stats.count)
+
+
+def record_refresh(summary: dict):
+    for field, value in summary.items():
+        if isinstance(value, (int, float)):
+            REFRESH_LAST.labels(field).set(value)
+
+
+class StatsCollector:
+    """Exposes the in-process stats() counters as gauges at scrape time."""
+
+    def collect(self):
+        hit_ratio = GaugeMetricFamily("betteredge_cache_hit_ratio", "Cache hit ratio", labels=["cache"])
+        events = GaugeMetricFamily("betteredge_cache_events", "Cache lookups by outcome", labels=["cache", "event"])
+        for cache, stats in (("quotes", quote_cache.stats()), ("search", ticker_search.stats())):
+            hit_ratio.add_metric([cache], stats.get("hit_ratio", 0.0))
+            for event, value in stats.items():
+                if event != "hit_ratio":
+                    events.add_metric([cache, event], value)
+        yield hit_ratio
+        yield events
+
+        audit = GaugeMetricFamily("betteredge_audit_log", "Audit log writer counters", labels=["event"])
+        for event, value in audit_log.stats().items():
+            audit.add_metric([event], float(value))
+        yield audit
+
+        executor = GaugeMetricFamily("betteredge_market_data_executor", "Upstream executor counters", labels=["stat"])
+        for stat, value in upstream.stats().items():
+            executor.add_metric([stat], float(value))
+        yield executor
+
+        pool = GaugeMetricFamily("betteredge_db_pool", "Connection pool state", labels=["engine", "stat"])
+        engines = [("primary", engine)] + ([("replica", read_engine)] if read_engine is not None else [])
+        for name, eng in engines:
+            for stat, value in pool_stats(eng.pool).items():
+                pool.add_metric([name, stat], value)
+        yield pool
+
+
+REGISTRY.register(StatsCollector())
+
+
+def _registry():
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(StatsCollector())
+    return registry
+
+
+def render() -> tuple[bytes, str]:
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int):
+    start_http_server(port, registry=_registry())
@@ -0,0 +1,142 @@
+"""
+
+Vectorized analytics over daily_returns.
+
+Price history is loaded into a contiguous (dates x assets) float64 matrix,
+with NaN where an asset has no row for a date, and every metric below is a
+NumPy expression over that matrix, no per-row Python loops.
+
+"""
+
+import warnings
+from datetime import date
+from uuid import UUID
+import numpy as np
+from sqlalchemy import any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.models.core_models import DailyReturn
+
+TRADING_DAYS = 252
+
+
+async def load_price_matrix(
+    session: AsyncSession,
+    asset_ids: list[UUID],
+    start: date | None = None,
+    end: date | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+        Return (dates, prices) where prices[i, j] is the adjusted close of the
+        j-th distinct id of asset_ids (first occurrence order) on dates[i].
+    """
+    stmt = select(
+        DailyReturn.date,
+        DailyReturn.asset_id,
+        func.coalesce(DailyReturn.adjusted_close, DailyReturn.close),
+    ).where(
+        DailyReturn.asset_id == any_(bindparam("asset_ids", list(asset_ids), type_=ARRAY(PG_UUID(as_uuid=True))))
+    )
+    if start:
+        stmt = stmt.where(DailyReturn.date >= start)
+    if end:
+        stmt = stmt.where(DailyReturn.date <= end)
+
+    rows = (await session.execute(stmt.order_by(DailyReturn.date))).all()
+    return pivot_prices(rows, asset_ids)
+
+
+def pivot_prices(rows, asset_ids: list[UUID]) -> tuple[np.ndarray, np.ndarray]:
+    # one column per distinct id, otherwise a repeated id would leave its first column empty
+    asset_ids = list(dict.fromkeys(asset_ids))
+    if not rows:
+        return np.array([], dtype="datetime64[D]"), np.empty((0, len(asset_ids)))
+
+    row_dates, row_assets, row_prices = zip(*rows)
+    dates, date_idx = np.unique(np.array(row_dates, dtype="datetime64[D]"), return_inverse=True)
+    column = {asset_id: j for j, asset_id in enumerate(asset_ids)}
+    asset_idx = np.fromiter((column[a] for a in row_assets), dtype=np.intp, count=len(row_assets))
+
+    prices = np.full((len(dates), len(asset_ids)), np.nan)
+    prices[date_idx, asset_idx] = np.array(row_prices, dtype=float)
+    return dates, np.ascontiguousarray(prices)
+
+
+def simple_returns(prices: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return prices[1:] / prices[:-1] - 1.0
+
+
+def cumulative_returns(returns: np.ndarray) -> np.ndarray:
+    return np.cumprod(1.0 + np.nan_to_num(returns), axis=0) - 1.0
+
+
+def annualized_volatility(returns: np.ndarray, periods: int = TRADING_DAYS) -> np.ndarray:
+    counts = np.sum(~np.isnan(returns), axis=0)
+    with warnings.catch_warnings():
+        # columns with fewer than two returns are masked below
+        warnings.simplefilter("ignore", RuntimeWarning)
+        std = np.nanstd(returns, axis=0, ddof=1)
+    return np.where(counts > 1, std * np.sqrt(periods), np.nan)
+
+
+def drawdown(prices: np.ndarray) -> np.ndarray:
+    """Drawdown from the running peak (0 at new highs, negative below them)."""
+    peaks = np.fmax.accumulate(prices, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return prices / peaks - 1.0
+
+
+def max_drawdown(prices: np.ndarray) -> np.ndarray:
+    dd = drawdown(prices)
+    if dd.shape[0] == 0:
+        return np.full(prices.shape[1:], np.nan)
+    worst = np.min(np.where(np.isnan(dd), np.inf, dd), axis=0)
+    return np.where(np.isinf(worst), np.nan, np.minimum(worst, 0.0))
+
+
+def beta(returns: np.ndarray, benchmark: np.ndarray) -> np.ndarray:
+    """Beta of every column of `returns` against `benchmark`, using dates where both exist."""
+    returns = returns.reshape(returns.shape[0], -1)
+    valid = ~np.isnan(returns) & ~np.isnan(benchmark)[:, None]
+    n = valid.sum(axis=0)
+    r = np.where(valid, returns, 0.0)
+    b = np.where(valid, benchmark[:, None], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r_mean = r.sum(axis=0) / n
+        b_mean = b.sum(axis=0) / n
+        cov = (np.where(valid, (r - r_mean) * (b - b_mean), 0.0)).sum(axis=0) / (n - 1)
+        var = (np.where(valid, (b - b_mean) ** 2, 0.0)).sum(axis=0) / (n - 1)
+        return np.where((n > 1) & (var > 0), cov / var, np.nan)
+
+
+def correlation_matrix(returns: np.ndarray) -> np.ndarray:
+    """Pearson correlation between columns over the dates where every column has a return."""
+    complete = returns[~np.isnan(returns).any(axis=1)]
+    if complete.shape[0] < 2:
+        return np.full((returns.shape[1], returns.shape[1]), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.atleast_2d(np.corrcoef(complete, rowvar=False))
+
+
+def portfolio_returns(returns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Daily returns of a portfolio rebalanced to `weights`, renormalised over assets with data."""
+    available = ~np.isnan(returns)
+    w = np.where(available, weights, 0.0)
+    total = w.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, (np.nan_to_num(returns) * w).sum(axis=1) / total, np.nan)
+
+
+def summarize(prices: np.ndarray, benchmark_returns: np.ndarray | None = None) -> dict[str, np.ndarray]:
+    """Per-column summary statistics for a (dates x assets) price matrix."""
+    returns = simple_returns(prices)
+    cumulative = cumulative_returns(returns)
+    summary = {
+        "total_return": cumulative[-1] if len(cumulative) else np.full(prices.shape[1:], np.nan),
+        "volatility": annualized_volatility(returns),
+        "max_drawdown": max_drawdown(prices),
+    }
+    if benchmark_returns is not None:
+        summary["beta"] = beta(returns, benchmark_returns)
+    return summary
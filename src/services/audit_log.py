@@ -0,0 +1,133 @@
+"""
+
+Buffered audit log writer.
+
+Requests only put a dict on a bounded in-memory queue (put_nowait, no I/O);
+a background task drains it and writes `logs` rows with one multi-row
+INSERT per batch, flushing when AUDIT_BATCH_SIZE entries are waiting or
+AUDIT_FLUSH_INTERVAL_SEC has passed since the first one. When the queue is
+full new entries are dropped and counted rather than slowing the request
+down. main.lifespan starts the writer and stops it on shutdown, which
+flushes whatever is still queued.
+
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from contextlib import suppress
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from src.config import settings
+from src.db.database import async_session
+from src.db.models.core_models import Log
+
+logger = logging.getLogger("betteredge.audit")
+
+
+class AuditLogWriter:
+
+    def __init__(self, session_factory, maxsize: int, batch_size: int, flush_interval: float):
+        self._session_factory = session_factory
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.counters: Counter[str] = Counter()
+        self._task: asyncio.Task | None = None
+        self._inflight: asyncio.Future | None = None
+        self._pending: list[dict] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def record(self, entry: dict) -> bool:
+        """Queue one `logs` row; never blocks. Returns False if it was dropped."""
+        if self._task is None:
+            return False
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+            return False
+        self.counters["queued"] += 1
+        return True
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+
+    async def stop(self):
+        """Stop the background task and flush everything still queued."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        if self._inflight is not None:
+            with suppress(Exception):
+                await self._inflight
+        batch, self._pending = self._pending, []
+        await self._flush(batch)
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    def _drain(self, limit: int) -> list[dict]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _next_batch(self):
+        # assembled in self._pending so stop() can still flush a partial batch
+        batch = self._pending
+        batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            batch.extend(self._drain(self.batch_size - len(batch)))
+            timeout = deadline - loop.time()
+            if len(batch) >= self.batch_size or timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        while True:
+            await self._next_batch()
+            batch, self._pending = self._pending, []
+            # shielded so a shutdown in the middle of a write doesn't lose the batch
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def _flush(self, batch: list[dict]):
+        if not batch:
+            return
+        try:
+            async with self._session_factory() as session:
+                await session.execute(insert(Log).values(batch))
+                await session.commit()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning("Erro ao gravar %d registros de auditoria: %s", len(batch), e)
+            self.counters["failed"] += len(batch)
+            return
+        self.counters["written"] += len(batch)
+        self.counters["batches"] += 1
+
+    def stats(self) -> dict[str, int | bool]:
+        return {**self.counters, "pending": self._queue.qsize(), "running": self.running}
+
+
+audit_log = AuditLogWriter(
+    async_session,
+    maxsize=settings.AUDIT_QUEUE_MAXSIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SEC,
+)
@@ -0,0 +1,42 @@
+"""
+
+App-lifetime pooled HTTP client for upstream calls.
+
+One httpx.AsyncClient is shared by the whole process so keep-alive
+connections (and HTTP/2 multiplexing) are reused across requests instead of
+paying a new TCP + TLS handshake per call. main.lifespan opens it on
+startup and closes it on shutdown; code running outside the app (tests,
+scripts) gets one lazily on first use.
+
+"""
+
+import httpx
+from src.config import settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=settings.HTTP2_ENABLED,
+        timeout=settings.HTTP_TIMEOUT_SEC,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SEC,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,332 @@
+"""
+
+Market data providers.
+
+Quotes, price history and symbol search go through the provider returned by
+get_provider(), selected with MARKET_DATA_PROVIDER:
+
+- "yahoo": yfinance downloads for quotes/history and the Yahoo search API
+  over the shared HTTP client.
+- "fake": deterministic prices and history computed from the symbol, with
+  FAKE_PROVIDER_LATENCY_MS per call and FAKE_PROVIDER_ERROR_RATE failures,
+  so refresh and search paths can be exercised and benchmarked offline.
+
+quote/quotes/history block (yfinance is synchronous), so callers run them
+through `upstream`, a bounded executor shared by the process:
+MARKET_DATA_MAX_WORKERS threads, at most MARKET_DATA_MAX_PENDING calls
+running or queued (further calls fail fast with UpstreamBusy instead of piling
+up behind a slow upstream) and a per-call timeout. A call that times out or
+whose caller is cancelled is dropped from the queue if it has not started;
+one already running cannot be interrupted, its result is discarded and it
+keeps its slot until it returns. search is a coroutine on the shared HTTP
+client and does not use the executor.
+
+"""
+
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from src.config import settings
+from src.services.http_client import get_http_client
+
+YF_SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://finance.yahoo.com/",
+}
+
+# (date, open, high, low, close, volume, adj_close); prices may be None
+Bar = tuple[date, float | None, float | None, float | None, float, float | None, float | None]
+
+logger = logging.getLogger("betteredge.quotes")
+
+
+class MarketDataError(Exception):
+    pass
+
+
+class UpstreamBusy(MarketDataError):
+    pass
+
+
+class UpstreamExecutor:
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.counters: Counter[str] = Counter()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="market-data")
+        return self._executor
+
+    def _done(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args, timeout: float | None = None):
+        """Run fn(*args) in the pool; raises UpstreamBusy, TimeoutError or fn's exception."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise UpstreamBusy(f"{self._pending} chamadas ao provedor pendentes")
+            self._pending += 1
+            self.counters["calls"] += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+
+        # cancelling the wrapper (timeout or caller gone) cancels the queued call too
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except TimeoutError:
+            self.counters["timeouts"] += 1
+            logger.warning("Chamada ao provedor %s excedeu %.1fs", getattr(fn, "__qualname__", fn), timeout)
+            raise
+        except asyncio.CancelledError:
+            self.counters["cancelled"] += 1
+            raise
+        except Exception:
+            self.counters["errors"] += 1
+            raise
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            **{k: self.counters[k] for k in ("calls", "rejected", "timeouts", "cancelled", "errors")},
+        }
+
+
+class MarketDataProvider:
+    name = "base"
+
+    def quote(self, symbol: str) -> tuple[float, float]:
+        """(price, prev_close) of one symbol."""
+        raise NotImplementedError
+
+    def quotes(self, symbols: list[str]) -> dict[str, tuple[float, float]]:
+        """{symbol: (price, prev_close)}; symbols without data are left out."""
+        raise NotImplementedError
+
+    def history(self, symbols: list[str], start: date, end: date) -> dict[str, list[Bar]]:
+        """Daily bars from start to end (inclusive), one per date, per symbol."""
+        raise NotImplementedError
+
+    async def search(self, q: str, count: int) -> list[dict]:
+        """Up to count {symbol, shortname, exchDisp, typeDisp} matches."""
+        raise NotImplementedError
+
+
+class YahooProvider(MarketDataProvider):
+    name = "yahoo"
+
+    def quote(self, symbol: str) -> tuple[float, float]:
+        import yfinance as yf  # heavy (pandas), only loaded once quotes are actually fetched
+
+        info = yf.Ticker(symbol).fast_info
+        return float(info.get("last_price")), float(info.get("previous_close"))
+
+    def quotes(self, symbols: list[str]) -> dict[str, tuple[float, float]]:
+        import yfinance as yf
+
+        data = yf.download(
+            symbols,
+            period="2d",
+            group_by="column",
+            auto_adjust=False,
+            threads=False,
+            progress=False,
+        )
+        if data is None or data.empty:
+            return {}
+
+        closes = data["Close"]
+        if not hasattr(closes, "columns"):
+            closes = closes.to_frame(name=symbols[0])
+
+        quotes = {}
+        for symbol in symbols:
+            if symbol not in closes.columns:
+                logger.warning("Sem dados para %s", symbol)
+                continue
+            series = closes[symbol].dropna()
+            if series.empty:
+                logger.warning("Sem dados para %s", symbol)
+                continue
+            price = float(series.iloc[-1])
+            prev = float(series.iloc[-2]) if len(series) > 1 else price
+            quotes[symbol] = (price, prev)
+        return quotes
+
+    def history(self, symbols: list[str], start: date, end: date) -> dict[str, list[Bar]]:
+        import yfinance as yf
+
+        data = yf.download(
+            symbols,
+            start=start,
+            end=end + timedelta(days=1),
+            group_by="column",
+            auto_adjust=False,
+            actions=False,
+            threads=True,
+            progress=False,
+        )
+        if data is None or data.empty:
+            return {}
+
+        multi = hasattr(data.columns, "levels")
+        history = {}
+        for symbol in symbols:
+            if multi and symbol not in data.columns.get_level_values(1):
+                continue
+            frame = data.xs(symbol, axis=1, level=1) if multi else data
+            frame = frame.dropna(subset=["Close"])
+            # one row per date, otherwise the merge would touch a row twice
+            frame = frame[~frame.index.duplicated(keep="last")]
+            history[symbol] = [
+                (
+                    day.date(), row.get("Open"), row.get("High"), row.get("Low"),
+                    row["Close"], row.get("Volume"), row.get("Adj Close"),
+                )
+                for day, row in frame.iterrows()
+            ]
+        return history
+
+    async def search(self, q: str, count: int) -> list[dict]:
+        params = {"q": q, "quotes_count": count, "news_count": 0}
+        r = await get_http_client().get(YF_SEARCH_URL, params=params, headers=HEADERS)
+        r.raise_for_status()
+        results = []
+        for it in r.json().get("quotes", [])[:count]:
+            if not it.get("symbol"):
+                continue
+            results.append({
+                "symbol": it["symbol"],
+                "shortname": it.get("shortname"),
+                "exchDisp": it.get("exchDisp"),
+                "typeDisp": it.get("typeDisp"),
+            })
+        return results
+
+
+class FakeProvider(MarketDataProvider):
+    """
+        Offline stand-in: every symbol has a stable price derived from its
+        crc32 and daily bars that oscillate around it, seeded by (symbol,
+        date). Each call sleeps latency_ms and fails with probability
+        error_rate.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency_ms: float = 0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def _call(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise MarketDataError("falha simulada do provedor")
+
+    @staticmethod
+    def price(symbol: str) -> tuple[float, float]:
+        seed = zlib.crc32(symbol.encode())
+        price = round(5 + seed % 50000 / 100, 2)
+        return price, round(price * (0.97 + seed % 600 / 10000), 4)
+
+    def quote(self, symbol: str) -> tuple[float, float]:
+        self._call()
+        return self.price(symbol)
+
+    def quotes(self, symbols: list[str]) -> dict[str, tuple[float, float]]:
+        self._call()
+        return {symbol: self.price(symbol) for symbol in symbols}
+
+    def history(self, symbols: list[str], start: date, end: date) -> dict[str, list[Bar]]:
+        self._call()
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        days = [d for d in days if d.weekday() < 5]
+        return {symbol: [self.bar(symbol, day) for day in days] for symbol in symbols}
+
+    @classmethod
+    def bar(cls, symbol: str, day: date) -> Bar:
+        # a function of (symbol, day) only, so overlapping ranges agree
+        price = cls.price(symbol)[0]
+        rng = random.Random(zlib.crc32(f"{symbol}:{day.isoformat()}".encode()))
+        close = price * (1 + 0.1 * math.sin(day.toordinal() / 20 + price) + rng.gauss(0, 0.01))
+        low, high = close * (1 - rng.uniform(0, 0.02)), close * (1 + rng.uniform(0, 0.02))
+        return (
+            day, round(rng.uniform(low, high), 6), round(high, 6), round(low, 6),
+            round(close, 6), float(rng.randint(10_000, 5_000_000)), round(close, 6),
+        )
+
+    async def search(self, q: str, count: int) -> list[dict]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.calls += 1
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise MarketDataError("falha simulada do provedor")
+        q = q.upper().replace(" ", "")
+        return [
+            {"symbol": f"{q}{i}.SA", "shortname": f"{q} {i}", "exchDisp": "São Paulo", "typeDisp": "Equity"}
+            for i in range(3, 3 + count)
+        ]
+
+
+upstream = UpstreamExecutor(settings.MARKET_DATA_MAX_WORKERS, settings.MARKET_DATA_MAX_PENDING)
+
+_provider: MarketDataProvider | None = None
+
+
+def _build_provider() -> MarketDataProvider:
+    name = settings.MARKET_DATA_PROVIDER.lower()
+    if name == "yahoo":
+        return YahooProvider()
+    if name == "fake":
+        return FakeProvider(settings.FAKE_PROVIDER_LATENCY_MS, settings.FAKE_PROVIDER_ERROR_RATE)
+    raise ValueError(f"MARKET_DATA_PROVIDER inválido: {settings.MARKET_DATA_PROVIDER}")
+
+
+def get_provider() -> MarketDataProvider:
+    global _provider
+    if _provider is None:
+        _provider = _build_provider()
+    return _provider
+
+
+def set_provider(provider: MarketDataProvider | None):
+    """Swap the process-wide provider (benchmarks, tests); None restores the configured one."""
+    global _provider
+    _provider = provider
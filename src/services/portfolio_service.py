@@ -0,0 +1,122 @@
+"""
+
+Client portfolio valuation.
+
+All allocations of the requested clients are loaded with a single
+Allocation JOIN Asset LEFT JOIN PriceQuote query, and market value, P&L,
+daily change and weights are computed over NumPy arrays, grouping per
+client with bincount instead of Python loops.
+
+"""
+
+import numpy as np
+from uuid import UUID
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.models.core_models import Allocation, Asset, PriceQuote
+
+
+def _none_if_nan(values: np.ndarray) -> list[float | None]:
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def value_rows(rows) -> dict[UUID, dict]:
+    """
+        rows: (client_id, ticker, quantity, avg_price, invested_amount, price, prev_close)
+        Positions without a quote keep price/market value as None and are left
+        out of totals and weights; those without prev_close are left out of
+        the daily change.
+    """
+    if not rows:
+        return {}
+
+    client_ids, tickers, *numeric = zip(*rows)
+    quantity, avg_price, invested, price, prev = (np.array(col, dtype=float) for col in numeric)
+    invested = np.nan_to_num(invested)
+
+    clients, codes = np.unique(np.array(client_ids, dtype=object), return_inverse=True)
+    n_clients = len(clients)
+
+    market_value = quantity * price
+    pnl = market_value - invested
+    day_change = quantity * (price - prev)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pnl_pct = np.where(invested > 0, pnl / invested, np.nan)
+
+    priced = ~np.isnan(market_value)
+    total_mv = np.bincount(codes, weights=np.where(priced, market_value, 0.0), minlength=n_clients)
+    total_invested = np.bincount(codes, weights=invested, minlength=n_clients)
+    total_priced_invested = np.bincount(codes, weights=np.where(priced, invested, 0.0), minlength=n_clients)
+    # day change only over positions with both price and prev_close, so one
+    # without prev_close does not inflate the previous market value
+    changed = ~np.isnan(day_change)
+    total_day = np.bincount(codes, weights=np.where(changed, day_change, 0.0), minlength=n_clients)
+    prev_mv = np.bincount(codes, weights=np.where(changed, quantity * prev, 0.0), minlength=n_clients)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.where(total_mv[codes] > 0, market_value / total_mv[codes], np.nan)
+        total_pnl = total_mv - total_priced_invested
+        total_pnl_pct = np.where(total_priced_invested > 0, total_pnl / total_priced_invested, np.nan)
+        total_day_pct = np.where(prev_mv > 0, total_day / prev_mv, np.nan)
+
+    columns = {
+        "quantity": quantity.tolist(),
+        "avg_price": _none_if_nan(avg_price),
+        "invested_amount": invested.tolist(),
+        "price": _none_if_nan(price),
+        "prev_close": _none_if_nan(prev),
+        "market_value": _none_if_nan(market_value),
+        "pnl": _none_if_nan(np.where(priced, pnl, np.nan)),
+        "pnl_pct": _none_if_nan(pnl_pct),
+        "day_change": _none_if_nan(day_change),
+        "weight": _none_if_nan(weight),
+    }
+
+    portfolios = {
+        client_id: {
+            "client_id": client_id,
+            "market_value": float(total_mv[i]),
+            "invested_amount": float(total_invested[i]),
+            "pnl": float(total_pnl[i]),
+            "pnl_pct": None if np.isnan(total_pnl_pct[i]) else float(total_pnl_pct[i]),
+            "day_change": float(total_day[i]),
+            "day_change_pct": None if np.isnan(total_day_pct[i]) else float(total_day_pct[i]),
+            "positions": [],
+        }
+        for i, client_id in enumerate(clients)
+    }
+    for row, code in enumerate(codes):
+        position = {"ticker": tickers[row]}
+        position.update({name: values[row] for name, values in columns.items()})
+        portfolios[clients[code]]["positions"].append(position)
+    return portfolios
+
+
+async def value_portfolios(session: AsyncSession, client_ids: list[UUID]) -> dict[UUID, dict]:
+    if not client_ids:
+        return {}
+
+    stmt = (
+        select(
+            Allocation.client_id,
+            Asset.ticker,
+            Allocation.quantity,
+            Allocation.avg_price,
+            Allocation.invested_amount,
+            PriceQuote.price,
+            PriceQuote.prev_close,
+        )
+        .join(Asset, Asset.id == Allocation.asset_id)
+        .outerjoin(PriceQuote, PriceQuote.ticker == Asset.ticker)
+        .where(
+            Allocation.client_id
+            == any_(bindparam("client_ids", list(client_ids), type_=ARRAY(PG_UUID(as_uuid=True))))
+        )
+    )
+    result = await session.execute(stmt)
+    return value_rows(result.all())
+
+
+async def value_portfolio(session: AsyncSession, client_id: UUID) -> dict | None:
+    return (await value_portfolios(session, [client_id])).get(client_id)
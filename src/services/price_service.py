@@ -1,40 +1,295 @@
 import asyncio
-import yfinance as yf
-from datetime import datetime, timedelta
-from sqlalchemy import select
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from redis.exceptions import LockError, RedisError
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.config import settings
+from src.db.database import async_session
 from src.db.models.core_models import PriceQuote
+from src.services.market_data import get_provider, upstream
+from src.services.quote_cache import quote_cache
 
 CACHE_TTL = settings.YF_CACHE_TTL_SEC
+UPSERT_CHUNK_SIZE = settings.QUOTE_UPSERT_CHUNK_SIZE
+BATCH_SIZE = settings.REFRESH_BATCH_SIZE
+MAX_CONCURRENCY = settings.REFRESH_MAX_CONCURRENCY
+LOCK_POLL_INTERVAL = 0.1
 
-async def _fetch_quote_yf(ticker:str) -> tuple[float, float]:
-    
-    def _sync_fetch():
-        
-        t = yf.Ticker(ticker)
-        info = t.fast_info
-        price = float(info.get("last_price"))
-        prev = float(info.get("previous_close"))
-        
+logger = logging.getLogger("betteredge.quotes")
+
+# ticker -> future of its in-flight refresh; shared by every caller in this process
+_inflight: dict[str, asyncio.Future] = {}
+
+async def _fetch_quote(ticker: str) -> tuple[float, float]:
+    return await upstream.run(get_provider().quote, ticker, timeout=settings.MARKET_DATA_TIMEOUT_SEC)
+
+async def fetch_quotes(symbols: list[str], max_concurrency: int | None = None) -> dict[str, tuple[float, float]]:
+    """
+        Download quotes in batches of BATCH_SIZE symbols, running at most
+        max_concurrency (default MAX_CONCURRENCY) provider downloads at once on
+        the upstream executor. Symbols without data are left out of the result.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or MAX_CONCURRENCY)
+    batches = [symbols[i:i + BATCH_SIZE] for i in range(0, len(symbols), BATCH_SIZE)]
+
+    provider = get_provider()
+
+    async def _run(batch: list[str]):
+        async with semaphore:
+            try:
+                return await upstream.run(provider.quotes, batch, timeout=settings.MARKET_DATA_BATCH_TIMEOUT_SEC)
+            except Exception as e:
+                logger.warning("Erro ao baixar lote de %d tickers: %s", len(batch), e)
+                return {}
+
+    quotes: dict[str, tuple[float, float]] = {}
+    for result in await asyncio.gather(*(_run(batch) for batch in batches)):
+        quotes.update(result)
+    return quotes
+
+async def upsert_quotes(session: AsyncSession, quotes: dict[str, tuple[float, float]]) -> int:
+    """
+        Write {ticker: (price, prev_close)} to price_quotes with one multi-row
+        INSERT ... ON CONFLICT per UPSERT_CHUNK_SIZE rows. Does not commit.
+    """
+    if not quotes:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"ticker": ticker, "price": price, "prev_close": prev, "updated_at": now}
+        for ticker, (price, prev) in quotes.items()
+    ]
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = insert(PriceQuote).values(rows[start:start + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PriceQuote.ticker],
+            set_={
+                "price": stmt.excluded.price,
+                "prev_close": stmt.excluded.prev_close,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await session.execute(stmt)
+    return len(rows)
+
+async def _store_quotes(quotes: dict[str, tuple[float, float]]):
+    # Refreshes outlive the request that started them, so they use their own session.
+    async with async_session() as session:
+        await upsert_quotes(session, quotes)
+        await session.commit()
+
+async def _wait_for_peer(ticker: str) -> tuple[float, float] | None:
+    """Wait for the worker holding the Redis lock to publish the quote."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.QUOTE_LOCK_WAIT_SEC
+    while loop.time() < deadline:
+        quote = await quote_cache.peek_remote(ticker)
+        if quote:
+            return quote
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+    return None
+
+async def _release(lock):
+    try:
+        await lock.release()
+    except (LockError, RedisError):
+        pass
+
+async def _refresh_quote(ticker: str) -> tuple[float, float]:
+    lock = quote_cache.lock(ticker, timeout=settings.QUOTE_LOCK_TTL_SEC)
+    try:
+        acquired = await lock.acquire()
+    except RedisError:
+        # without Redis there is nothing to coordinate with, fetch locally
+        lock, acquired = None, False
+
+    if lock is not None and not acquired:
+        quote = await _wait_for_peer(ticker)
+        if quote:
+            quote_cache.record("coalesced_remote")
+            quote_cache.local.set(ticker, quote)
+            return quote
+
+    try:
+        quote_cache.record("upstream_fetch")
+        price, prev = await _fetch_quote(ticker)
+        await _store_quotes({ticker: (price, prev)})
+        await quote_cache.set(ticker, price, prev)
         return price, prev
-    
-    return await asyncio.to_thread(_sync_fetch())
+    finally:
+        if acquired:
+            await _release(lock)
+
+def _forget(ticker: str, future: asyncio.Future):
+    if _inflight.get(ticker) is future:
+        del _inflight[ticker]
+    if not future.cancelled() and future.exception():
+        logger.warning("Erro ao atualizar cotação de %s: %s", ticker, future.exception())
+
+def _refresh_coalesced(ticker: str) -> asyncio.Future:
+    """
+        Single-flight: concurrent misses for the same ticker share one refresh
+        in this process, and the Redis lock in _refresh_quote extends that
+        across API and worker processes.
+    """
+    future = _inflight.get(ticker)
+    if future is not None:
+        quote_cache.record("coalesced_local")
+        return future
+
+    future = asyncio.ensure_future(_refresh_quote(ticker))
+    _inflight[ticker] = future
+    future.add_done_callback(partial(_forget, ticker))
+    return future
 
 async def get_quote(session: AsyncSession, ticker: str) -> tuple[float, float]:
+    cached = await quote_cache.get(ticker)
+    if cached:
+        return cached
+
     q = await session.execute(select(PriceQuote).where(PriceQuote.ticker == ticker))
     pq = q.scalar_one_or_none()
-    now = datetime.utcnow()
-    if pq and (now - pq.updated_at) < timedelta(seconds=CACHE_TTL):
-        return float(pq.price), float(pq.prev_close)
-    
-    price, prev = await _fetch_quote_yf(ticker)
     if pq:
-        pq.price, pq.prev_close, pq.updated_at = price, prev, now
-    else:
-        pq = PriceQuote(ticker=ticker, price=price, prev_close=prev, updated_at=now)
-        session.add(pq)
-        
-    await session.commit()
-    return price, prev
-    
+        age = datetime.now(timezone.utc) - pq.updated_at
+        price, prev = float(pq.price), float(pq.prev_close)
+        if age < timedelta(seconds=CACHE_TTL):
+            quote_cache.record("db_hit")
+            await quote_cache.set(ticker, price, prev)
+            return price, prev
+
+        if settings.QUOTE_STALE_WHILE_REVALIDATE and age < timedelta(seconds=settings.QUOTE_MAX_STALE_SEC):
+            quote_cache.record("stale_served")
+            _refresh_coalesced(ticker)
+            return price, prev
+
+    # shield: a cancelled caller must not cancel the fetch other callers share
+    return await asyncio.shield(_refresh_coalesced(ticker))
+
+async def _download(tickers: list[str]) -> dict[str, tuple[float, float]]:
+    if not tickers:
+        return {}
+    quote_cache.record("upstream_fetch", len(tickers))
+    quotes = await fetch_quotes(tickers)
+    await _store_quotes(quotes)
+    await quote_cache.set_many(quotes)
+    return quotes
+
+async def _wait_for_peers(tickers: list[str]) -> dict[str, tuple[float, float]]:
+    results = await asyncio.gather(*(_wait_for_peer(t) for t in tickers))
+    quotes = {t: quote for t, quote in zip(tickers, results) if quote}
+    if quotes:
+        quote_cache.record("coalesced_remote", len(quotes))
+        for ticker, quote in quotes.items():
+            quote_cache.local.set(ticker, quote)
+    return quotes
+
+async def _refresh_batch(tickers: list[str]) -> dict[str, tuple[float, float]]:
+    """
+        Batch counterpart of _refresh_quote: takes the Redis lock of every
+        ticker, downloads the ones it got in one batch and meanwhile waits for
+        the peers holding the others, fetching those itself if they never
+        publish.
+    """
+    locks = {t: quote_cache.lock(t, timeout=settings.QUOTE_LOCK_TTL_SEC) for t in tickers}
+    # an acquire that fails (Redis down) leaves the ticker to be fetched locally
+    acquired = await asyncio.gather(*(lock.acquire() for lock in locks.values()), return_exceptions=True)
+    held = [locks[t] for t, ok in zip(tickers, acquired) if ok is True]
+    busy = [t for t, ok in zip(tickers, acquired) if ok is False]
+    try:
+        own = [t for t in tickers if t not in busy]
+        quotes, from_peers = await asyncio.gather(_download(own), _wait_for_peers(busy))
+        quotes.update(from_peers)
+        quotes.update(await _download([t for t in busy if t not in from_peers]))
+        return quotes
+    finally:
+        await asyncio.gather(*(_release(lock) for lock in held))
+
+def _refresh_batch_coalesced(tickers: list[str]) -> dict[str, asyncio.Future]:
+    """
+        Batch counterpart of _refresh_coalesced: tickers already in flight reuse
+        their refresh, the rest share one _refresh_batch (locked per ticker in
+        Redis, like _refresh_quote) and each get a future in _inflight
+        resolving to their own quote.
+    """
+    futures = {t: _inflight[t] for t in tickers if t in _inflight}
+    quote_cache.record("coalesced_local", len(futures))
+    to_fetch = [t for t in tickers if t not in futures]
+    if not to_fetch:
+        return futures
+
+    loop = asyncio.get_running_loop()
+    batch = asyncio.ensure_future(_refresh_batch(to_fetch))
+    for ticker in to_fetch:
+        future = loop.create_future()
+        _inflight[ticker] = futures[ticker] = future
+        future.add_done_callback(partial(_forget, ticker))
+
+    def _resolve(task: asyncio.Task):
+        for ticker in to_fetch:
+            future = futures[ticker]
+            if future.done():
+                continue
+            if task.cancelled():
+                future.cancel()
+            elif task.exception():
+                future.set_exception(task.exception())
+            elif ticker in task.result():
+                future.set_result(task.result()[ticker])
+            else:
+                future.set_exception(LookupError(f"Sem dados para {ticker}"))
+
+    batch.add_done_callback(_resolve)
+    return futures
+
+async def get_quotes(session: AsyncSession, tickers: list[str]) -> dict[str, tuple[float, float]]:
+    """
+        Batch version of get_quote: one cache MGET, one `ticker = ANY(...)`
+        query and one batched upstream download for the remaining misses.
+        Tickers that could not be priced are left out of the result.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    quotes = await quote_cache.get_many(tickers)
+    pending = [t for t in tickers if t not in quotes]
+    if not pending:
+        return quotes
+
+    stmt = select(PriceQuote).where(
+        PriceQuote.ticker == any_(bindparam("tickers", pending, type_=ARRAY(String)))
+    )
+    rows = (await session.execute(stmt)).scalars().all()
+
+    now = datetime.now(timezone.utc)
+    fresh, stale = {}, {}
+    for pq in rows:
+        age = now - pq.updated_at
+        quote = float(pq.price), float(pq.prev_close)
+        if age < timedelta(seconds=CACHE_TTL):
+            fresh[pq.ticker] = quote
+        elif settings.QUOTE_STALE_WHILE_REVALIDATE and age < timedelta(seconds=settings.QUOTE_MAX_STALE_SEC):
+            stale[pq.ticker] = quote
+
+    if fresh:
+        quote_cache.record("db_hit", len(fresh))
+        await quote_cache.set_many(fresh)
+    if stale:
+        quote_cache.record("stale_served", len(stale))
+        _refresh_batch_coalesced(list(stale))
+    quotes.update(fresh)
+    quotes.update(stale)
+
+    misses = [t for t in pending if t not in quotes]
+    if not misses:
+        return quotes
+
+    futures = _refresh_batch_coalesced(misses)
+    results = await asyncio.gather(
+        *(asyncio.shield(f) for f in futures.values()), return_exceptions=True
+    )
+    for ticker, result in zip(futures, results):
+        if not isinstance(result, BaseException):
+            quotes[ticker] = result
+    return quotes
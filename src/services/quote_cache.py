@@ -0,0 +1,123 @@
+"""
+
+Quote cache shared by the API and the Celery worker.
+
+Lookups go through two tiers before the database:
+    1. in-process LRU (QUOTE_LOCAL_TTL_SEC)
+    2. Redis `price:{ticker}` keys (QUOTE_REDIS_TTL_SEC, falls back to YF_CACHE_TTL_SEC)
+
+Redis failures are logged and treated as misses, so the caller falls back to
+Postgres/yfinance instead of failing.
+
+"""
+
+import logging
+from collections import Counter
+from redis.exceptions import RedisError
+from src.config import settings
+from src.db.redis_client import redis_client
+from src.services.cache import LocalTTLCache
+
+logger = logging.getLogger("betteredge.cache")
+
+Quote = tuple[float, float]
+
+
+def _key(ticker: str) -> str:
+    return f"price:{ticker}"
+
+
+def _decode(data: str) -> Quote:
+    price, prev = map(float, data.split(","))
+    return price, prev
+
+
+class QuoteCache:
+
+    def __init__(self, redis, local_ttl: int, redis_ttl: int, maxsize: int):
+        self.redis = redis
+        self.redis_ttl = redis_ttl
+        self.local = LocalTTLCache(maxsize=maxsize, ttl=local_ttl)
+        self.counters: Counter[str] = Counter()
+
+    def record(self, event: str, amount: int = 1):
+        self.counters[event] += amount
+
+    async def get(self, ticker: str) -> Quote | None:
+        return (await self.get_many([ticker])).get(ticker)
+
+    async def get_many(self, tickers: list[str]) -> dict[str, Quote]:
+        quotes: dict[str, Quote] = {}
+        remote = []
+        for ticker in tickers:
+            quote = self.local.get(ticker)
+            if quote is None:
+                remote.append(ticker)
+            else:
+                quotes[ticker] = quote
+        self.record("local_hit", len(quotes))
+        if not remote:
+            return quotes
+
+        try:
+            values = await self.redis.mget([_key(ticker) for ticker in remote])
+        except RedisError as e:
+            logger.warning("Redis indisponível para leitura de cotações: %s", e)
+            self.record("redis_error")
+            values = [None] * len(remote)
+
+        for ticker, data in zip(remote, values):
+            if data:
+                quote = _decode(data)
+                quotes[ticker] = quote
+                self.local.set(ticker, quote)
+                self.record("redis_hit")
+            else:
+                self.record("miss")
+        return quotes
+
+    async def peek_remote(self, ticker: str) -> Quote | None:
+        """Read the Redis tier only, without touching counters or the local tier."""
+        try:
+            data = await self.redis.get(_key(ticker))
+        except RedisError:
+            return None
+        return _decode(data) if data else None
+
+    def lock(self, ticker: str, timeout: int):
+        """Cross-process lock guarding the upstream refresh of one ticker."""
+        return self.redis.lock(f"lock:{_key(ticker)}", timeout=timeout, blocking=False)
+
+    async def set(self, ticker: str, price: float, prev: float):
+        await self.set_many({ticker: (price, prev)})
+
+    async def set_many(self, quotes: dict[str, Quote]):
+        if not quotes:
+            return
+        for ticker, quote in quotes.items():
+            self.local.set(ticker, quote)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for ticker, (price, prev) in quotes.items():
+                    pipe.set(_key(ticker), f"{price},{prev}", ex=self.redis_ttl)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Redis indisponível para escrita de cotações: %s", e)
+            self.record("redis_error")
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = sum(self.counters[k] for k in ("local_hit", "redis_hit", "miss"))
+        hits = self.counters["local_hit"] + self.counters["redis_hit"]
+        return {
+            **self.counters,
+            "local_size": len(self.local),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+quote_cache = QuoteCache(
+    redis=redis_client,
+    local_ttl=settings.QUOTE_LOCAL_TTL_SEC,
+    redis_ttl=settings.QUOTE_REDIS_TTL_SEC or settings.YF_CACHE_TTL_SEC,
+    maxsize=settings.QUOTE_LOCAL_MAXSIZE,
+)
@@ -0,0 +1,119 @@
+"""
+
+In-memory prefix index over the assets we already hold.
+
+Every asset is indexed by its ticker (with and without the exchange suffix,
+e.g. "PETR4.SA" and "PETR4") and by each word of its name, so typeahead
+queries for known symbols are answered without leaving the process. The
+index is loaded in main.lifespan and updated when an asset is created;
+assets created by other workers are still found through the trigram query
+in search_assets until the next restart.
+
+"""
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db.models.core_models import Asset
+
+TRIGRAM_LIMIT = 20
+
+
+class _Node:
+    __slots__ = ("children", "symbols")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.symbols: set[str] = set()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def to_result(asset) -> dict:
+    asset_type = getattr(asset.asset_type, "value", asset.asset_type)
+    return {
+        "symbol": asset.ticker,
+        "shortname": asset.name,
+        "exchDisp": asset.exchange,
+        "typeDisp": asset_type,
+    }
+
+
+class TickerIndex:
+
+    def __init__(self):
+        self._root = _Node()
+        self._entries: dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, key: str, symbol: str):
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            node.symbols.add(symbol)
+
+    def _prefix(self, key: str) -> set[str]:
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.symbols
+
+    def add(self, entry: dict):
+        symbol = entry["symbol"]
+        self._entries[symbol] = entry
+        ticker = symbol.lower()
+        self._insert(ticker, symbol)
+        self._insert(ticker.split(".")[0], symbol)
+        for word in _normalize(entry.get("shortname") or "").split():
+            self._insert(word, symbol)
+
+    def add_asset(self, asset):
+        self.add(to_result(asset))
+
+    def search(self, q: str, limit: int) -> list[dict]:
+        """Ticker-prefix matches first (shortest ticker first), then name-word matches."""
+        words = _normalize(q).split()
+        if not words:
+            return []
+
+        by_ticker = self._prefix(words[0]) if len(words) == 1 else set()
+        by_name = set.intersection(*(self._prefix(word) for word in words)) - by_ticker
+
+        ranked = sorted(by_ticker, key=lambda s: (len(s), s)) + sorted(by_name)
+        return [self._entries[symbol] for symbol in ranked[:limit]]
+
+    async def load(self, session: AsyncSession):
+        result = await session.execute(select(Asset.ticker, Asset.name, Asset.exchange, Asset.asset_type))
+        self._root = _Node()
+        self._entries = {}
+        for row in result.all():
+            self.add(to_result(row))
+
+
+async def search_assets(session: AsyncSession, q: str, limit: int = TRIGRAM_LIMIT) -> list[dict]:
+    """Substring / fuzzy match on ticker and name, served by the pg_trgm GIN indexes."""
+    # % and _ in q are literal characters, not wildcards
+    pattern = f"%{_like_escape(q)}%"
+    stmt = (
+        select(Asset.ticker, Asset.name, Asset.exchange, Asset.asset_type)
+        .where(or_(
+            Asset.ticker.ilike(pattern, escape="\\"),
+            Asset.name.ilike(pattern, escape="\\"),
+            Asset.name.op("%")(q),
+        ))
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return [to_result(row) for row in result.all()]
+
+
+ticker_index = TickerIndex()
@@ -0,0 +1,120 @@
+"""
+
+Ticker search, local first.
+
+Queries are answered from the in-memory ticker_index and, failing that, the
+pg_trgm match over `assets`; the market data provider (Yahoo) is only called
+when neither has enough results (fewer than quotes_count and no exact symbol
+match). Remote results are cached per normalized (q, quotes_count) in an
+in-process LRU (SEARCH_LOCAL_TTL_SEC) backed by Redis `search:*` keys
+(SEARCH_REDIS_TTL_SEC), so repeated typeahead keystrokes are served without
+calling the provider.
+
+"""
+
+import json
+import logging
+from collections import Counter
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config import settings
+from src.db.redis_client import redis_client
+from src.services.cache import LocalTTLCache
+from src.services.market_data import get_provider
+from src.services.ticker_index import search_assets, ticker_index
+
+logger = logging.getLogger("betteredge.search")
+
+local_cache = LocalTTLCache(maxsize=settings.SEARCH_CACHE_MAXSIZE, ttl=settings.SEARCH_LOCAL_TTL_SEC)
+counters: Counter[str] = Counter()
+
+
+def normalize_query(q: str) -> str:
+    return " ".join(q.lower().split())
+
+
+def _key(q: str, quotes_count: int) -> str:
+    return f"search:{quotes_count}:{q}"
+
+
+async def _cache_get(key: str) -> list[dict] | None:
+    results = local_cache.get(key)
+    if results is not None:
+        counters["local_hit"] += 1
+        return results
+    try:
+        data = await redis_client.get(key)
+    except RedisError as e:
+        logger.warning("Redis indisponível para leitura da busca: %s", e)
+        counters["redis_error"] += 1
+        data = None
+    if data is None:
+        counters["miss"] += 1
+        return None
+    counters["redis_hit"] += 1
+    results = json.loads(data)
+    local_cache.set(key, results)
+    return results
+
+
+async def _cache_set(key: str, results: list[dict]):
+    local_cache.set(key, results)
+    try:
+        await redis_client.set(key, json.dumps(results), ex=settings.SEARCH_REDIS_TTL_SEC)
+    except RedisError as e:
+        logger.warning("Redis indisponível para escrita da busca: %s", e)
+        counters["redis_error"] += 1
+
+
+def _merge(results: list[dict], more: list[dict]) -> list[dict]:
+    seen = {r["symbol"] for r in results}
+    return results + [r for r in more if r["symbol"] not in seen]
+
+
+def _is_sufficient(results: list[dict], q: str, quotes_count: int) -> bool:
+    if len(results) >= quotes_count:
+        return True
+    key = q.upper()
+    return any(r["symbol"] == key or r["symbol"].split(".")[0] == key for r in results)
+
+
+async def _search_db(session: AsyncSession, q: str, quotes_count: int) -> list[dict]:
+    try:
+        return await search_assets(session, q, quotes_count)
+    except SQLAlchemyError as e:
+        logger.warning("Erro ao buscar ativos no banco: %s", e)
+        counters["db_error"] += 1
+        return []
+
+
+async def search_tickers(q: str, quotes_count: int, session: AsyncSession | None = None) -> list[dict]:
+    q = normalize_query(q)
+    results = ticker_index.search(q, quotes_count)
+    if _is_sufficient(results, q, quotes_count):
+        counters["index_hit"] += 1
+        return results
+
+    if session is not None:
+        results = _merge(results, await _search_db(session, q, quotes_count))[:quotes_count]
+        if _is_sufficient(results, q, quotes_count):
+            counters["db_hit"] += 1
+            return results
+
+    key = _key(q, quotes_count)
+    remote = await _cache_get(key)
+    if remote is None:
+        counters["remote"] += 1
+        remote = await get_provider().search(q, quotes_count)
+        await _cache_set(key, remote)
+    return _merge(results, remote)[:quotes_count]
+
+
+def stats() -> dict[str, int | float]:
+    lookups = sum(counters[k] for k in ("local_hit", "redis_hit", "miss"))
+    hits = counters["local_hit"] + counters["redis_hit"]
+    return {
+        **counters,
+        "local_size": len(local_cache),
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+    }
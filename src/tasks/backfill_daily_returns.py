@@ -0,0 +1,177 @@
+"""
+
+Historical backfill for daily_returns.
+
+For every asset the job only asks the market data provider for dates after
+the latest one already stored (or BACKFILL_YEARS back for new assets),
+downloads tickers sharing the same start date in batches, COPYs the rows into a temporary staging table and
+merges them into daily_returns on (asset_id, date). Each batch commits on its
+own, so an interrupted run resumes where it stopped.
+
+usage:
+    python -m src.tasks.backfill_daily_returns [--years 5] [--tickers PETR4.SA VALE3.SA]
+
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.config import settings
+from src.db.database import async_session
+from src.db.models.core_models import Asset, DailyReturn
+from src.services.market_data import Bar, get_provider, upstream
+from src.tasks.runtime import async_task
+
+BATCH_SIZE = settings.BACKFILL_BATCH_SIZE
+
+COLUMNS = (
+    "id", "asset_id", "date", "open", "high", "low",
+    "close", "volume", "adjusted_close", "created_at",
+)
+
+STAGING_TABLE = "daily_returns_staging"
+
+CREATE_STAGING = text(
+    f"CREATE TEMP TABLE {STAGING_TABLE} (LIKE daily_returns INCLUDING DEFAULTS) ON COMMIT DROP"
+)
+
+MERGE_STAGING = text(f"""
+    INSERT INTO daily_returns ({", ".join(COLUMNS)})
+    SELECT {", ".join(COLUMNS)} FROM {STAGING_TABLE}
+    ON CONFLICT (asset_id, date) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        adjusted_close = EXCLUDED.adjusted_close
+""")
+
+logger = logging.getLogger("betteredge.tasks")
+
+
+@async_task(name="backfill_daily_returns")
+async def backfill_daily_returns(years: int | None = None, tickers: list[str] | None = None):
+    return await backfill(years or settings.BACKFILL_YEARS, tickers)
+
+
+async def backfill(years: int, tickers: list[str] | None = None) -> dict:
+    started = time.perf_counter()
+    today = date.today()
+    async with async_session() as session:
+        plan = await _load_plan(session, today - timedelta(days=365 * years), tickers)
+
+    by_start, up_to_date = _group_by_start(plan, today)
+    summary = {"assets": 0, "batches": 0, "rows": 0, "up_to_date": up_to_date}
+
+    provider = get_provider()
+    for start, assets in sorted(by_start.items()):
+        for i in range(0, len(assets), BATCH_SIZE):
+            batch = dict(assets[i:i + BATCH_SIZE])
+            try:
+                history = await upstream.run(
+                    provider.history, list(batch.values()), start, today,
+                    timeout=settings.MARKET_DATA_BATCH_TIMEOUT_SEC,
+                )
+            except Exception as e:
+                logger.warning("Erro ao baixar histórico de %d tickers: %s", len(batch), e)
+                continue
+
+            records = _to_records(batch, history)
+            async with async_session() as session:
+                await _copy_merge(session, records)
+                await session.commit()
+
+            summary["assets"] += len(batch)
+            summary["batches"] += 1
+            summary["rows"] += len(records)
+            logger.info("backfill: %d linhas para %d ativos a partir de %s", len(records), len(batch), start)
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_sec"] = round(elapsed, 3)
+    summary["rows_per_sec"] = round(summary["rows"] / elapsed, 2) if elapsed else 0.0
+    logger.info("backfill_daily_returns: %s", summary)
+    return summary
+
+
+async def _load_plan(session: AsyncSession, default_start: date, tickers: list[str] | None):
+    """(asset_id, ticker, first date to fetch) for every asset."""
+    stmt = (
+        select(Asset.id, Asset.ticker, func.max(DailyReturn.date))
+        .outerjoin(DailyReturn, DailyReturn.asset_id == Asset.id)
+        .group_by(Asset.id, Asset.ticker)
+    )
+    if tickers:
+        stmt = stmt.where(Asset.ticker.in_(tickers))
+    rows = (await session.execute(stmt)).all()
+    return [
+        (asset_id, ticker, latest + timedelta(days=1) if latest else default_start)
+        for asset_id, ticker, latest in rows
+    ]
+
+
+def _group_by_start(plan, today: date) -> tuple[dict[date, list[tuple[uuid.UUID, str]]], int]:
+    """Assets to fetch keyed by their first missing date, and how many are already up to date."""
+    by_start: dict[date, list[tuple[uuid.UUID, str]]] = defaultdict(list)
+    up_to_date = 0
+    for asset_id, ticker, start in plan:
+        if start > today:
+            up_to_date += 1
+        else:
+            by_start[start].append((asset_id, ticker))
+    return dict(by_start), up_to_date
+
+
+def _decimal(value) -> Decimal | None:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return Decimal(str(round(float(value), 6)))
+
+
+def _to_records(batch: dict[uuid.UUID, str], history: dict[str, list[Bar]]) -> list[tuple]:
+    now = datetime.now(timezone.utc)
+    records = []
+    for asset_id, ticker in batch.items():
+        # last bar wins for a repeated date: ON CONFLICT cannot update a row twice
+        bars = {bar[0]: bar for bar in history.get(ticker, ())}
+        for day, open_, high, low, close, volume, adj_close in bars.values():
+            records.append((
+                uuid.uuid4(),
+                asset_id,
+                day,
+                _decimal(open_),
+                _decimal(high),
+                _decimal(low),
+                _decimal(close),
+                _decimal(volume),
+                _decimal(adj_close),
+                now,
+            ))
+    return records
+
+
+async def _copy_merge(session: AsyncSession, records: list[tuple]):
+    if not records:
+        return
+    await session.execute(CREATE_STAGING)
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(STAGING_TABLE, records=records, columns=COLUMNS)
+    await session.execute(MERGE_STAGING)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=settings.BACKFILL_YEARS)
+    parser.add_argument("--tickers", nargs="*")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    print(asyncio.run(backfill(args.years, args.tickers)))
@@ -1,11 +1,17 @@
 from celery import Celery
+from celery.schedules import crontab
 from src.config import settings
 
 app = Celery(
     "quotes",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["src.tasks.refresh_quotes"],
+    include=[
+        "src.tasks.refresh_quotes",
+        "src.tasks.backfill_daily_returns",
+        "src.tasks.partition_maintenance",
+        "src.tasks.task_metrics",
+    ],
 )
 
 app.conf.beat_schedule = {
@@ -13,4 +19,12 @@ app.conf.beat_schedule = {
         "task": "refresh_quotes",
         "schedule": 300,  # 300s = 5 minutos
     },
+    "backfill-daily-returns-nightly": {
+        "task": "backfill_daily_returns",
+        "schedule": crontab(hour=22, minute=0),  # depois do fechamento da B3
+    },
+    "partition-maintenance-daily": {
+        "task": "partition_maintenance",
+        "schedule": crontab(hour=3, minute=0),
+    },
 }
\ No newline at end of file
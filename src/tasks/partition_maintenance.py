@@ -0,0 +1,159 @@
+"""
+
+Partition maintenance for the range-partitioned tables.
+
+    logs           monthly on created_at   (logs_y2026m10)
+    daily_returns  yearly on date          (daily_returns_y2026)
+
+Runs daily: creates the partitions for the next PARTITION_PREMAKE_MONTHS /
+PARTITION_PREMAKE_YEARS periods so inserts never land in the default
+partition, and expires partitions older than the retention setting by
+detaching them into PARTITION_ARCHIVE_SCHEMA (or dropping them when it is
+empty). Rows that already reached the default partition for a period are
+moved into the new partition when it is created.
+
+usage:
+    python -m src.tasks.partition_maintenance
+
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+from datetime import date
+from sqlalchemy import text
+from src.config import settings
+from src.db.database import engine
+from src.tasks.runtime import async_task
+
+logger = logging.getLogger("betteredge.tasks")
+
+
+class PartitionedTable:
+
+    def __init__(self, name: str, column: str, monthly: bool, premake: int, retention: int | None):
+        self.name = name
+        self.column = column
+        self.monthly = monthly
+        self.premake = premake
+        self.retention = retention
+
+    def period_start(self, day: date) -> date:
+        return date(day.year, day.month if self.monthly else 1, 1)
+
+    def shift(self, start: date, periods: int) -> date:
+        if not self.monthly:
+            return date(start.year + periods, 1, 1)
+        months = start.year * 12 + start.month - 1 + periods
+        return date(months // 12, months % 12 + 1, 1)
+
+    def partition_name(self, start: date) -> str:
+        suffix = f"y{start.year}m{start.month:02d}" if self.monthly else f"y{start.year}"
+        return f"{self.name}_{suffix}"
+
+    def parse(self, partition: str) -> date | None:
+        pattern = r"_y(\d{4})m(\d{2})" if self.monthly else r"_y(\d{4})"
+        match = re.fullmatch(re.escape(self.name) + pattern, partition)
+        if not match:
+            return None
+        return date(int(match.group(1)), int(match.group(2)) if self.monthly else 1, 1)
+
+
+TABLES = [
+    PartitionedTable("logs", "created_at", True, settings.PARTITION_PREMAKE_MONTHS, settings.LOGS_RETENTION_MONTHS),
+    PartitionedTable("daily_returns", "date", False, settings.PARTITION_PREMAKE_YEARS, settings.DAILY_RETURNS_RETENTION_YEARS),
+]
+
+
+def plan(table: PartitionedTable, today: date, existing: list[str]) -> tuple[list[date], list[str]]:
+    """Period starts to create and partition names to expire."""
+    current = table.period_start(today)
+    present = {table.parse(name) for name in existing}
+    to_create = [
+        start for start in (table.shift(current, k) for k in range(table.premake + 1))
+        if start not in present
+    ]
+
+    to_expire = []
+    if table.retention is not None:
+        oldest = table.shift(current, -table.retention)
+        to_expire = sorted(
+            name for name in existing
+            if (start := table.parse(name)) is not None and start < oldest
+        )
+    return to_create, to_expire
+
+
+LIST_PARTITIONS = text("""
+    SELECT child.relname FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table
+""")
+
+
+async def _create_partition(conn, table: PartitionedTable, start: date):
+    name = table.partition_name(start)
+    lo, hi = start, table.shift(start, 1)
+    in_range = f"{table.column} >= '{lo}' AND {table.column} < '{hi}'"
+
+    stray = (await conn.execute(text(f"SELECT count(*) FROM {table.name}_default WHERE {in_range}"))).scalar()
+    if not stray:
+        await conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {table.name} FOR VALUES FROM ('{lo}') TO ('{hi}')"
+        ))
+        return
+
+    # a partition can't be created while the default one holds rows for its range
+    await conn.execute(text(f"CREATE TABLE {name} (LIKE {table.name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    await conn.execute(text(f"INSERT INTO {name} SELECT * FROM {table.name}_default WHERE {in_range}"))
+    await conn.execute(text(f"DELETE FROM {table.name}_default WHERE {in_range}"))
+    await conn.execute(text(
+        f"ALTER TABLE {table.name} ATTACH PARTITION {name} FOR VALUES FROM ('{lo}') TO ('{hi}')"
+    ))
+    logger.info("partições: %d linhas movidas de %s_default para %s", stray, table.name, name)
+
+
+async def _expire_partition(conn, table: PartitionedTable, name: str):
+    schema = settings.PARTITION_ARCHIVE_SCHEMA
+    # the environment can only unset it as an empty string
+    if not schema:
+        await conn.execute(text(f"DROP TABLE {name}"))
+        return
+    await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+    await conn.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {name}"))
+    await conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+
+
+@async_task(name="partition_maintenance")
+async def partition_maintenance():
+    return await maintain_partitions()
+
+
+async def maintain_partitions(today: date | None = None) -> dict:
+    today = today or date.today()
+    summary = {"created": [], "expired": []}
+    for table in TABLES:
+        async with engine.connect() as conn:
+            existing = list((await conn.execute(LIST_PARTITIONS, {"table": table.name})).scalars())
+        to_create, to_expire = plan(table, today, existing)
+
+        for start in to_create:
+            async with engine.begin() as conn:
+                await _create_partition(conn, table, start)
+            summary["created"].append(table.partition_name(start))
+        for name in to_expire:
+            async with engine.begin() as conn:
+                await _expire_partition(conn, table, name)
+            summary["expired"].append(name)
+
+    logger.info("partition_maintenance: %s", summary)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    print(asyncio.run(maintain_partitions()))
@@ -1,100 +1,157 @@
-import redis.asyncio as redis
+"""
+
+Periodic quote refresh.
+
+The beat job `refresh_quotes` loads the ticker universe once and fans it out
+into REFRESH_SHARDS `refresh_quotes_shard` tasks, shard k getting the tickers
+with crc32(ticker) % REFRESH_SHARDS == k, so adding worker containers
+(`docker compose up --scale worker=N`) splits the universe between them.
+Shard starts are staggered by REFRESH_SHARD_STAGGER_SEC so they do not all
+hit the provider at the same instant, and the shards split
+REFRESH_MAX_CONCURRENCY between them (at least one download each), so the
+whole fan-out keeps about the same number of concurrent provider downloads
+as a single refresh. A chord collects the shard summaries into
+`refresh_quotes_summary`, which logs the totals and the duration of every
+shard. With REFRESH_SHARDS=1 the whole refresh runs inside `refresh_quotes`.
+
+"""
+
 import asyncio
-import yfinance as yf
-from celery import shared_task
+import logging
+import time
+import zlib
+from celery import chord
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.db.database import get_session
+from src import metrics
+from src.db.database import async_session
 from src.config import settings
+from src.services.price_service import fetch_quotes, upsert_quotes
+from src.services.quote_cache import quote_cache
 from src.tasks.celery_app import app
+from src.tasks.runtime import async_task, runtime
 
+COUNTS = ("tickers", "cached", "fetched", "failed")
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    ),
-    "Accept": "application/json, text/javascript, */*; q=0.01",
-}
+logger = logging.getLogger("betteredge.tasks")
+
+
+def shard_of(ticker: str, shards: int) -> int:
+    # crc32, not hash(): it must agree across worker processes
+    return zlib.crc32(ticker.encode()) % shards
 
-redis = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
 
 @app.task(name="refresh_quotes")
-def refresh_quotes():
-    loop = asyncio.get_event_loop()
-    if loop.is_running():
-        return loop.create_task(_refresh_quotes_async())
-    else:
-        return loop.run_until_complete(_refresh_quotes_async())
-    
-async def _refresh_quotes_async():
-    async for session in get_session():
-        tickers = await _get_distinct_tickers(session)
-        for symbol in tickers:
-            try:
-                
-                cached = await _get_price_from_cache(symbol)
-                if cached:
-                    price, prev = cached
-                else:
-                    price, prev = await _fetch_price(symbol)
-                    await _set_price_to_cache(symbol, price, prev)
-                await _save_quote(session, symbol, price, prev)
-            except Exception as e:
-                print(f"Erro ao atualizar {symbol}: {e}")
+def refresh_quotes(shards: int | None = None):
+    shards = shards or settings.REFRESH_SHARDS
+    if shards <= 1:
+        return runtime.run(_refresh_quotes_async(), timeout=settings.REFRESH_TIMEOUT_SEC, name="refresh_quotes")
+
+    tickers = runtime.run(_load_tickers(), timeout=settings.REFRESH_TIMEOUT_SEC, name="refresh_quotes")
+    by_shard = [[] for _ in range(shards)]
+    for ticker in tickers:
+        by_shard[shard_of(ticker, shards)].append(ticker)
+
+    header = [
+        refresh_quotes_shard.s(shard, shards, by_shard[shard]).set(countdown=shard * settings.REFRESH_SHARD_STAGGER_SEC)
+        for shard in range(shards)
+    ]
+    result = chord(header)(refresh_quotes_summary.s(time.time()))
+    logger.info("refresh_quotes: %d shards agendados (%s)", shards, result.id)
+    return {"shards": shards, "summary_id": result.id}
+
+
+@async_task(name="refresh_quotes_shard")
+async def refresh_quotes_shard(shard: int, shards: int, tickers: list[str]):
+    # failures are reported in the summary instead of failing the whole chord
+    try:
+        async with asyncio.timeout(settings.REFRESH_TIMEOUT_SEC):
+            return await _refresh_quotes_async(tickers, shard, shards)
+    except Exception as e:
+        logger.warning("refresh_quotes: shard %d/%d falhou: %r", shard, shards, e)
+        return {"shard": shard, "error": repr(e)}
+
+
+@app.task(name="refresh_quotes_summary")
+def refresh_quotes_summary(results: list[dict], started_at: float):
+    summary = summarize(results, time.time() - started_at)
+    logger.info(
+        "refresh_quotes: %(tickers)d tickers (%(cached)d cached, %(fetched)d fetched, %(failed)d failed) "
+        "across %(shards)d shards (%(shard_errors)d failed) in %(elapsed_sec).2fs - %(tickers_per_sec).1f tickers/s",
+        summary,
+    )
+    for shard in summary["per_shard"]:
+        logger.info("refresh_quotes: %s", shard)
+    metrics.record_refresh(summary)
+    return summary
+
+
+def summarize(results: list[dict], elapsed: float) -> dict:
+    """Totals over the shard summaries; elapsed is the wall time since the fan-out."""
+    ok = [r for r in results if "error" not in r]
+    durations = [r["elapsed_sec"] for r in ok]
+    summary = {key: sum(r[key] for r in ok) for key in COUNTS}
+    summary.update(
+        shards=len(results),
+        shard_errors=len(results) - len(ok),
+        elapsed_sec=round(elapsed, 3),
+        tickers_per_sec=round(summary["tickers"] / elapsed, 2) if elapsed else 0.0,
+        shard_max_sec=max(durations, default=0.0),
+        shard_min_sec=min(durations, default=0.0),
+        per_shard=sorted(
+            ({k: r[k] for k in ("shard", "tickers", "elapsed_sec", "error") if k in r} for r in results),
+            key=lambda r: r["shard"],
+        ),
+    )
+    return summary
+
+
+async def _refresh_quotes_async(tickers: list[str] | None = None, shard: int | None = None, shards: int = 1):
+    """Refresh tickers (default: every distinct asset ticker); shard/shards label a fan-out shard."""
+    started = time.perf_counter()
+    summary = {"tickers": 0, "cached": 0, "fetched": 0, "failed": 0}
+    # shards run in parallel, so each gets its share of REFRESH_MAX_CONCURRENCY
+    concurrency = max(1, settings.REFRESH_MAX_CONCURRENCY // shards) if shards > 1 else None
+    async with async_session() as session:
+        if tickers is None:
+            tickers = await _get_distinct_tickers(session)
+        summary["tickers"] = len(tickers)
+
+        quotes = await quote_cache.get_many(tickers)
+        summary["cached"] = len(quotes)
+
+        misses = [symbol for symbol in tickers if symbol not in quotes]
+        fetched = await fetch_quotes(misses, concurrency)
+        await quote_cache.set_many(fetched)
+        quotes.update(fetched)
+        summary["fetched"] = len(fetched)
+        summary["failed"] = len(misses) - len(fetched)
+
+        await upsert_quotes(session, quotes)
         await session.commit()
-        
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_sec"] = round(elapsed, 3)
+    summary["tickers_per_sec"] = round(summary["tickers"] / elapsed, 2) if elapsed else 0.0
+    if shard is None:
+        label = "refresh_quotes"
+        metrics.record_refresh(summary)
+    else:
+        label = f"refresh_quotes shard {shard}/{shards}"
+        summary["shard"] = shard
+        metrics.REFRESH_SHARD_SECONDS.labels(str(shard)).set(elapsed)
+    logger.info(
+        "%s: %d tickers (%d cached, %d fetched, %d failed) in %.2fs - %.1f tickers/s",
+        label, summary["tickers"], summary["cached"], summary["fetched"], summary["failed"],
+        summary["elapsed_sec"], summary["tickers_per_sec"],
+    )
+    return summary
+
+async def _load_tickers() -> list[str]:
+    async with async_session() as session:
+        return await _get_distinct_tickers(session)
+
 async def _get_distinct_tickers(session: AsyncSession):
     from sqlalchemy import select
     from src.db.models.core_models import Asset
     res = await session.execute(select(Asset.ticker).distinct())
-    print(res)
     return [row[0] for row in res.all()]
-
-async def _fetch_price(symbol: str):
-    ticker = yf.Ticker(symbol)
-    data = ticker.history(period="2d")
-    if data.empty:
-        raise ValueError(f"Sem dados para {symbol}")
-    if len(data) == 1 :
-        price = float(data["Close"].iloc[-1])
-        prev = price
-    else:
-        price = float(data["Close"].iloc[-1])
-        prev = float(data["Close"].iloc[-2])
-        
-    return price, prev
-
-async def _save_quote(session: AsyncSession, symbol: str, price: float, prev: float):
-    from datetime import datetime, timezone
-    from src.db.models.core_models import PriceQuote
-    from sqlalchemy.dialects.postgresql import insert
-    
-    stmt = insert(PriceQuote).values(
-        ticker=symbol,
-        price=price,
-        prev_close=prev,
-        updated_at=datetime.now(timezone.utc),
-    ).on_conflict_do_update(
-        index_elements=["ticker"],  # coluna única
-        set_={
-            "price": price,
-            "prev_close": prev,
-            "updated_at": datetime.now(timezone.utc),
-        },
-    )
-    await session.execute(stmt)
-    
-async def _get_price_from_cache(symbol: str):
-    key = f"price:{symbol}"
-    data = await redis.get(key)
-    if data:
-        price, prev = map(float, data.split(","))
-        return price, prev
-    return None
-
-async def _set_price_to_cache(symbol: str, price: float, prev: float):
-    key = f"price:{symbol}"
-    await redis.set(key, f"{price},{prev}", ex=settings.YF_CACHE_TTL_SEC)
-    
-
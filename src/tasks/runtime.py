@@ -0,0 +1,144 @@
+"""
+
+Async runtime for Celery workers.
+
+Each worker process keeps one event loop running in a background thread for
+its whole life, so the SQLAlchemy pools, the Redis connection pool and the
+HTTP client, which are all bound to the loop that opened their connections,
+are reused by every task instead of being rebuilt (or left pointing at a dead
+loop) per run. Tasks declared with @async_task are coroutines; the Celery
+side only submits them to that loop and waits for the result, so with
+`--pool threads --concurrency N` up to N tasks run concurrently on the loop
+while blocking market data calls go to the upstream executor.
+
+The loop starts on first use and is restarted in a forked child (prefork
+pool), whose inherited connections are discarded first. Time between
+submission and the coroutine actually starting is exported as
+betteredge_celery_task_loop_wait_seconds, next to the task durations
+recorded by src.tasks.task_metrics.
+
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Coroutine
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from src import metrics
+from src.db.database import engine, read_engine
+from src.db.redis_client import redis_client
+from src.services.http_client import close_http_client
+from src.services.market_data import upstream
+from src.tasks.celery_app import app
+
+logger = logging.getLogger("betteredge.tasks")
+
+
+class WorkerRuntime:
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def _serve(self, ready: threading.Event):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return self.loop
+            ready = threading.Event()
+            self.loop = asyncio.new_event_loop()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._serve, args=(ready,), name="task-loop", daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info("Loop de tarefas iniciado (pid %d)", self._pid)
+            return self.loop
+
+    def submit(self, coro: Coroutine, name: str = "-"):
+        """Schedule coro on the worker loop; returns a concurrent.futures.Future."""
+        loop = self.start()
+        submitted = time.perf_counter()
+
+        async def _timed():
+            metrics.TASK_LOOP_WAIT.labels(name).observe(time.perf_counter() - submitted)
+            return await coro
+
+        return asyncio.run_coroutine_threadsafe(_timed(), loop)
+
+    def run(self, coro: Coroutine, timeout: float | None = None, name: str = "-"):
+        """Run coro on the worker loop and block until it finishes; cancels it on timeout."""
+        if self._thread is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("runtime.run() chamado dentro do loop de tarefas")
+        future = self.submit(coro, name)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 10):
+        """Close the loop-bound clients and stop the loop thread."""
+        if self.loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(_close_clients(), self.loop).result(timeout)
+        except Exception as e:
+            logger.warning("Erro ao encerrar conexões do worker: %s", e)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        self.loop.close()
+        self.loop = self._thread = None
+
+
+async def _close_clients():
+    await close_http_client()
+    await redis_client.aclose()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
+runtime = WorkerRuntime()
+
+
+def async_task(*, timeout: float | None = None, **options):
+    """
+        Register a coroutine function as a Celery task that runs on the
+        worker loop; timeout (seconds) cancels it there. Calling the task
+        directly still runs it synchronously.
+    """
+    def decorator(fn: Callable[..., Coroutine]):
+        name = options.get("name", fn.__name__)
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            return runtime.run(fn(*args, **kwargs), timeout=timeout, name=name)
+
+        return app.task(**options)(run)
+
+    return decorator
+
+
+@worker_process_init.connect
+def _after_fork(**_):
+    # connections inherited from the parent belong to its loop and sockets
+    engine.sync_engine.dispose(close=False)
+    if read_engine is not None:
+        read_engine.sync_engine.dispose(close=False)
+    redis_client.connection_pool.reset()
+    upstream.shutdown()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _shutdown(**_):
+    runtime.stop()
+    upstream.shutdown()
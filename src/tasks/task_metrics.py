@@ -0,0 +1,37 @@
+"""
+
+Celery signal handlers feeding the task metrics in src.metrics, plus the
+worker's own /metrics HTTP endpoint on CELERY_METRICS_PORT.
+
+"""
+
+import time
+from celery.signals import task_failure, task_postrun, task_prerun, worker_init
+from src import metrics
+from src.config import settings
+
+_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _task_started(task_id=None, **_):
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, state=None, **_):
+    started = _started.pop(task_id, None)
+    if started is not None:
+        metrics.TASK_DURATION.labels(task.name).observe(time.perf_counter() - started)
+    metrics.TASKS.labels(task.name, state or "UNKNOWN").inc()
+
+
+@task_failure.connect
+def _task_failed(sender=None, **_):
+    metrics.TASK_FAILURES.labels(sender.name).inc()
+
+
+@worker_init.connect
+def _serve_metrics(**_):
+    if settings.CELERY_METRICS_PORT:
+        metrics.start_metrics_server(settings.CELERY_METRICS_PORT)
@@ -0,0 +1,84 @@
+from uuid import uuid4
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from httpx import AsyncClient, ASGITransport
+from src.api.middleware import AuditMiddleware, _client_ip, route_label
+from src.config import settings
+from src.db.models.core_models import LogActionEnum
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.entries = []
+
+    def record(self, entry):
+        self.entries.append(entry)
+        return True
+
+
+def _app(writer):
+    app = FastAPI()
+    app.add_middleware(AuditMiddleware, writer=writer)
+
+    @app.get("/clientes/{client_id}")
+    async def get_client(client_id: str):
+        return {}
+
+    @app.post("/ativos/")
+    async def create_asset():
+        raise HTTPException(status_code=400, detail="Ticker is required")
+
+    @app.get("/metrics/db-pool")
+    async def metrics():
+        return {}
+
+    return app
+
+
+async def test_audit_entries():
+    writer = RecordingWriter()
+    client_id = uuid4()
+    transport = ASGITransport(app=_app(writer))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get(f"/clientes/{client_id}", headers={"User-Agent": "pytest", "X-Forwarded-For": "10.0.0.1, 10.0.0.2"})
+        await client.post("/ativos/")
+        await client.get("/metrics/db-pool")
+
+    first, second = writer.entries
+    assert first["action"] == LogActionEnum.ACCESS
+    assert first["entity"] == "clientes"
+    assert first["entity_id"] == client_id
+    assert first["ip_address"] == "127.0.0.1"  # no trusted proxies: X-Forwarded-For is ignored
+    assert first["user_agent"] == "pytest"
+    assert first["description"] == f"GET /clientes/{client_id} -> 200"
+    assert second["action"] == LogActionEnum.ERROR
+    assert second["entity_id"] is None
+
+
+async def test_route_label():
+    labels = []
+    router = APIRouter()
+
+    @router.get("/ticker/{ticker}")
+    async def get_by_ticker(ticker: str, request: Request):
+        labels.append(route_label(request.scope))
+        return {}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/ativos")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/ativos/ticker/ticker")
+        await client.get("/ativos/ticker/ativos")
+
+    assert labels == ["/ativos/ticker/{ticker}"] * 2
+    assert route_label({"path": "/nope"}) == "unmatched"
+
+
+def test_client_ip_trusts_forwarded_for_only_from_proxies(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", "10.0.0.0/8, 192.168.1.1")
+    xff = {b"x-forwarded-for": b"6.6.6.6, 203.0.113.7, 10.0.0.2"}
+
+    assert _client_ip({"client": ("192.168.1.1", 1)}, xff) == "203.0.113.7"
+    assert _client_ip({"client": ("198.51.100.9", 1)}, xff) == "198.51.100.9"
+    assert _client_ip({"client": ("10.0.0.3", 1)}, {}) == "10.0.0.3"
+    assert _client_ip({"client": ("10.0.0.3", 1)}, {b"x-forwarded-for": b"10.1.1.1, 10.0.0.2"}) == "10.1.1.1"
@@ -1,6 +1,6 @@
 import asyncio
 import pytest_asyncio
-from src.db.database import get_session
+from src.db.database import get_read_session, get_session
 from httpx import AsyncClient, ASGITransport
 from src.main import app
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -30,6 +30,7 @@ async def async_session():
 @pytest_asyncio.fixture
 async def async_client(async_session: AsyncSession):
     app.dependency_overrides[get_session] = lambda: async_session
+    app.dependency_overrides[get_read_session] = lambda: async_session
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -62,7 +63,7 @@ async def test_get_allocation_by_client_id(async_client):
     list_clients = await async_client.get("/clientes/")
     clients_id = list_clients.json()[0]["id"]
 
-    response = await async_client.get(route + "?client=" + clients_id, follow_redirects=True)
+    response = await async_client.get(route + "?client_id=" + clients_id, follow_redirects=True)
 
     assert response.status_code == 200
     data = response.json()
@@ -1,6 +1,6 @@
 import asyncio
 import pytest_asyncio
-from src.db.database import get_session
+from src.db.database import get_read_session, get_session
 from httpx import AsyncClient, ASGITransport
 from src.main import app
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -31,6 +31,7 @@ async def async_session():
 @pytest_asyncio.fixture
 async def async_client(async_session: AsyncSession):
     app.dependency_overrides[get_session] = lambda: async_session
+    app.dependency_overrides[get_read_session] = lambda: async_session
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
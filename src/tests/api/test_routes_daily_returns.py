@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from uuid import uuid4
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.services import analytics_service
+
+base_url = "http://test"
+route = "/dailyReturns/analytics"
+
+A, B = uuid4(), uuid4()
+CLOSES = {A: [10.0, 11.0, 10.5, 12.0], B: [20.0, 19.0, 21.0, 22.0]}
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url=base_url) as client:
+        yield client
+
+
+@pytest.fixture
+def prices(monkeypatch):
+    async def fake_load(session, asset_ids, start=None, end=None):
+        rows = [
+            (date(2025, 1, 2) + timedelta(days=i), asset_id, close)
+            for asset_id in dict.fromkeys(asset_ids)
+            for i, close in enumerate(CLOSES[asset_id])
+        ]
+        return analytics_service.pivot_prices(rows, asset_ids)
+
+    monkeypatch.setattr(analytics_service, "load_price_matrix", fake_load)
+
+
+async def test_asset_benchmarked_against_itself(async_client, prices):
+    response = await async_client.get(f"{route}/{A}", params={"benchmark_id": str(A)})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_return"] == pytest.approx(0.2)
+    assert data["beta"] == pytest.approx(1.0)
+
+
+async def test_portfolio_benchmark_among_assets(async_client, prices):
+    response = await async_client.post(
+        f"{route}/portfolio", json={"asset_ids": [str(A), str(B)], "benchmark_id": str(A)}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["total_return"] for a in data["assets"]] == pytest.approx([0.2, 0.1])
+    assert data["assets"][0]["beta"] == pytest.approx(1.0)
+    assert data["portfolio"]["beta"] is not None
+
+
+async def test_portfolio_weights_summing_to_zero(async_client, prices):
+    response = await async_client.post(
+        f"{route}/portfolio", json={"asset_ids": [str(A), str(B)], "weights": [1.0, -1.0]}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Weights must not sum to zero"
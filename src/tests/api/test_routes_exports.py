@@ -0,0 +1,56 @@
+import asyncio
+import json
+import pytest_asyncio
+from uuid import uuid4
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.db.models.core_models import AssetTypeEnum
+
+if hasattr(asyncio, "WindowsSelectorEventLoopPolicy"):
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+base_url = "http://test"
+route = "/exports"
+
+ROWS = [
+    [(uuid4(), "PETR4.SA", "Petrobras PN", AssetTypeEnum.ACAO, "BRL", None, 0, True, None, None)],
+    [(uuid4(), "HGLG11.SA", "CSHG Logística", AssetTypeEnum.FII, "BRL", None, 0, True, None, None)],
+]
+
+
+@pytest_asyncio.fixture
+async def async_client(monkeypatch):
+    async def fake_stream_rows(table):
+        for rows in ROWS:
+            yield rows
+
+    monkeypatch.setattr("src.api.routes_exports._stream_rows", fake_stream_rows)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url=base_url) as client:
+        yield client
+
+
+async def test_export_ndjson(async_client):
+    response = await async_client.get(route + "/assets")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["ticker"] for line in lines] == ["PETR4.SA", "HGLG11.SA"]
+    assert lines[1]["asset_type"] == "fii"
+
+
+async def test_export_csv(async_client):
+    response = await async_client.get(route + "/assets?format=csv")
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,ticker,name,asset_type")
+    assert len(lines) == 3
+
+
+async def test_export_unknown_collection(async_client):
+    response = await async_client.get(route + "/users")
+
+    assert response.status_code == 422
@@ -0,0 +1,49 @@
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.config import settings
+from src.db.database import engine
+
+base_url = "http://test"
+route = "/metrics"
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url=base_url) as client:
+        yield client
+
+
+async def test_db_pool_metrics(async_client):
+    engine.pool.reset_wait_stats()
+
+    response = await async_client.get(f"{route}/db-pool")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith('db;dur=0.0;desc="0 queries", app;dur=')
+    assert response.json() == {
+        "size": settings.DB_POOL_SIZE,
+        "checked_out": 0,
+        "idle": 0,
+        "overflow": 0,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "acquired": 0,
+        "timeouts": 0,
+        "wait_avg_ms": 0.0,
+        "wait_max_ms": 0.0,
+    }
+
+
+async def test_prometheus_metrics(async_client):
+    await async_client.get(f"{route}/db-pool")
+
+    response = await async_client.get(route)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'betteredge_http_requests_total{method="GET",route="/metrics/db-pool",status="200"}' in body
+    assert 'betteredge_http_request_db_queries_count{method="GET",route="/metrics/db-pool"}' in body
+    assert 'betteredge_cache_hit_ratio{cache="quotes"}' in body
+    assert 'betteredge_db_pool{engine="primary",stat="size"}' in body
@@ -0,0 +1,38 @@
+import asyncio
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+
+if hasattr(asyncio, "WindowsSelectorEventLoopPolicy"):
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+base_url = "http://test"
+route = "/tickers"
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url=base_url) as client:
+        yield client
+
+
+async def test_batch_quotes_requires_tickers(async_client):
+    response = await async_client.post(route + "/quotes", json={"tickers": [" "]})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Tickers are required"
+
+
+async def test_batch_quotes(async_client, monkeypatch):
+    async def fake_get_quotes(session, tickers):
+        return {"PETR4.SA": (38.5, 37.9)}
+
+    monkeypatch.setattr("src.api.routes_tickers.get_quotes", fake_get_quotes)
+
+    response = await async_client.post(route + "/quotes", json={"tickers": ["petr4.sa", "XXXX3.SA"]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["quotes"] == {"PETR4.SA": {"price": 38.5, "prev_close": 37.9}}
+    assert data["missing"] == ["XXXX3.SA"]
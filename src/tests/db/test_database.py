@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from src.db import database
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def __aenter__(self):
+        if isinstance(self.engine.lag, Exception):
+            raise self.engine.lag
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        self.engine.checks += 1
+        return FakeResult(self.engine.lag)
+
+
+class FakeEngine:
+    def __init__(self, lag):
+        self.lag = lag
+        self.checks = 0
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    def install(lag):
+        engine = FakeEngine(lag)
+        monkeypatch.setattr(database, "read_engine", engine)
+        monkeypatch.setattr(database, "async_read_session", "replica")
+        monkeypatch.setattr(database, "async_session", "primary")
+        monkeypatch.setattr(database, "_replica", {"checked_at": float("-inf"), "fresh": False})
+        monkeypatch.setattr(database.settings, "READ_REPLICA_MAX_LAG_SEC", 5)
+        return engine
+    return install
+
+
+async def test_reads_go_to_primary_without_replica(monkeypatch):
+    monkeypatch.setattr(database, "read_engine", None)
+
+    assert await database.read_sessionmaker() is database.async_session
+
+
+@pytest.mark.parametrize("lag, expected", [(0, "replica"), (None, "replica"), (2.5, "replica"), (30, "primary")])
+async def test_replica_lag_threshold(replica, lag, expected):
+    replica(lag)
+
+    assert await database.read_sessionmaker() == expected
+
+
+async def test_replica_error_falls_back_to_primary(replica):
+    replica(OperationalError("SELECT 1", {}, Exception("down")))
+
+    assert await database.read_sessionmaker() == "primary"
+
+
+async def test_lag_check_is_cached(replica):
+    engine = replica(0)
+
+    for _ in range(3):
+        await database.read_sessionmaker()
+
+    assert engine.checks == 1
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from src.db.pool import InstrumentedQueuePool, pool_stats
+
+
+def test_timeouts_are_not_counted_as_acquired(monkeypatch):
+    pool = InstrumentedQueuePool(lambda: None, pool_size=1, max_overflow=0)
+    outcomes = iter(["connection", exc.TimeoutError("pool exhausted"), "connection"])
+
+    def fake_do_get(self):
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(AsyncAdaptedQueuePool, "_do_get", fake_do_get)
+
+    assert pool._do_get() == "connection"
+    with pytest.raises(exc.TimeoutError):
+        pool._do_get()
+    assert pool._do_get() == "connection"
+
+    stats = pool_stats(pool)
+    assert stats["acquired"] == 2
+    assert stats["timeouts"] == 1
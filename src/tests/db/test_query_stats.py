@@ -0,0 +1,62 @@
+import logging
+from types import SimpleNamespace
+from src.db import query_stats
+
+
+def _execute(statement="SELECT 1", executemany=False):
+    context = SimpleNamespace()
+    query_stats._before_cursor_execute(None, None, statement, {}, context, executemany)
+    query_stats._after_cursor_execute(None, None, statement, {}, context, executemany)
+
+
+def test_counts_queries_inside_a_request_only():
+    _execute()
+
+    stats, token = query_stats.begin()
+    _execute()
+    _execute()
+    query_stats.end(token)
+    _execute()
+
+    assert stats.count == 2
+    assert stats.total_sec >= 0
+    assert stats.server_timing().endswith('desc="2 queries"')
+    assert query_stats.current() is None
+
+
+def test_slow_query_is_logged_with_route(monkeypatch, caplog):
+    monkeypatch.setattr(query_stats.settings, "SLOW_QUERY_MS", 0)
+
+    stats, token = query_stats.begin(lambda: "GET /clientes/{client_id}")
+    with caplog.at_level(logging.WARNING, logger="betteredge.sql"):
+        _execute("SELECT * FROM clients")
+    query_stats.end(token)
+
+    assert "GET /clientes/{client_id}" in caplog.text
+    assert "SELECT * FROM clients" in caplog.text
+
+
+def test_n_plus_one_detection(monkeypatch, caplog):
+    monkeypatch.setattr(query_stats.settings, "N_PLUS_ONE_DETECTION", True)
+    monkeypatch.setattr(query_stats.settings, "N_PLUS_ONE_THRESHOLD", 3)
+
+    stats, token = query_stats.begin(lambda: "GET /alocacoes/")
+    for _ in range(3):
+        _execute("SELECT * FROM assets WHERE id = $1")
+    _execute("INSERT INTO logs VALUES ($1)", executemany=True)
+    with caplog.at_level(logging.WARNING, logger="betteredge.sql"):
+        query_stats.end(token)
+
+    assert stats.repeated() == [("SELECT * FROM assets WHERE id = $1", 3)]
+    assert "N+1 em GET /alocacoes/" in caplog.text
+
+
+def test_n_plus_one_detection_off(monkeypatch):
+    monkeypatch.setattr(query_stats.settings, "N_PLUS_ONE_DETECTION", False)
+
+    stats, token = query_stats.begin()
+    for _ in range(20):
+        _execute()
+    query_stats.end(token)
+
+    assert stats.repeated() == []
@@ -0,0 +1,74 @@
+from datetime import date
+from uuid import uuid4
+import numpy as np
+import pytest
+from src.services import analytics_service as analytics
+
+
+def test_pivot_prices_aligns_assets_on_dates():
+    a, b = uuid4(), uuid4()
+    rows = [
+        (date(2025, 1, 2), a, 10.0),
+        (date(2025, 1, 2), b, 20.0),
+        (date(2025, 1, 3), a, 11.0),
+    ]
+
+    dates, prices = analytics.pivot_prices(rows, [a, b])
+
+    assert dates.tolist() == [date(2025, 1, 2), date(2025, 1, 3)]
+    assert prices[:, 0].tolist() == [10.0, 11.0]
+    assert prices[0, 1] == 20.0
+    assert np.isnan(prices[1, 1])
+    assert prices.flags["C_CONTIGUOUS"]
+
+
+def test_returns_and_drawdown():
+    prices = np.array([[100.0], [110.0], [99.0], [121.0]])
+
+    returns = analytics.simple_returns(prices)
+    cumulative = analytics.cumulative_returns(returns)
+
+    assert returns[:, 0] == pytest.approx([0.1, -0.1, 121 / 99 - 1])
+    assert cumulative[-1, 0] == pytest.approx(0.21)
+    assert analytics.max_drawdown(prices)[0] == pytest.approx(-0.1)
+
+
+def test_beta_and_correlation():
+    rng = np.random.default_rng(7)
+    market = rng.normal(0, 0.01, 500)
+    returns = np.column_stack([2 * market, -market, market + rng.normal(0, 0.01, 500)])
+
+    betas = analytics.beta(returns, market)
+    corr = analytics.correlation_matrix(returns)
+
+    assert betas[0] == pytest.approx(2.0)
+    assert betas[1] == pytest.approx(-1.0)
+    assert corr[0, 1] == pytest.approx(-1.0)
+    assert np.diag(corr) == pytest.approx([1.0, 1.0, 1.0])
+
+
+def test_volatility_ignores_missing_days():
+    returns = np.array([[0.01, np.nan], [-0.01, np.nan], [0.02, 0.01]])
+
+    vol = analytics.annualized_volatility(returns)
+
+    assert vol[0] == pytest.approx(np.std([0.01, -0.01, 0.02], ddof=1) * np.sqrt(252))
+    assert np.isnan(vol[1])
+
+
+def test_portfolio_returns_renormalises_missing_assets():
+    returns = np.array([[0.1, 0.0], [0.1, np.nan]])
+
+    result = analytics.portfolio_returns(returns, np.array([0.5, 0.5]))
+
+    assert result == pytest.approx([0.05, 0.1])
+
+
+def test_pivot_prices_repeated_id_gets_one_column():
+    a = uuid4()
+    rows = [(date(2025, 1, 2), a, 10.0), (date(2025, 1, 3), a, 11.0)]
+
+    _, prices = analytics.pivot_prices(rows, [a, a])
+
+    assert prices.shape == (2, 1)
+    assert prices[:, 0].tolist() == [10.0, 11.0]
@@ -0,0 +1,89 @@
+import asyncio
+from sqlalchemy.exc import OperationalError
+from src.services.audit_log import AuditLogWriter
+
+
+class FakeSession:
+    def __init__(self, sink):
+        self.sink = sink
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        if self.sink.fail:
+            raise OperationalError("INSERT", {}, Exception("down"))
+        self.sink.batches.append(len(stmt._multi_values[0]))
+
+    async def commit(self):
+        pass
+
+
+class Sink:
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+def _entry(i):
+    return {"action": "ACCESS", "entity": "clientes", "description": f"GET /clientes/{i}"}
+
+
+async def test_flushes_on_batch_size_and_on_stop():
+    sink = Sink()
+    writer = AuditLogWriter(sink, maxsize=100, batch_size=3, flush_interval=60)
+    writer.start()
+
+    for i in range(7):
+        writer.record(_entry(i))
+    await asyncio.sleep(0.01)
+    assert sink.batches == [3, 3]
+
+    await writer.stop()
+    assert sink.batches == [3, 3, 1]
+    assert writer.stats()["written"] == 7
+
+
+async def test_flushes_on_interval():
+    sink = Sink()
+    writer = AuditLogWriter(sink, maxsize=100, batch_size=100, flush_interval=0.02)
+    writer.start()
+
+    writer.record(_entry(1))
+    writer.record(_entry(2))
+    await asyncio.sleep(0.05)
+
+    assert sink.batches == [2]
+    await writer.stop()
+
+
+async def test_full_queue_drops_instead_of_blocking():
+    sink = Sink()
+    writer = AuditLogWriter(sink, maxsize=2, batch_size=10, flush_interval=60)
+    writer.start()
+
+    results = [writer.record(_entry(i)) for i in range(4)]
+
+    assert results == [True, True, False, False]
+    assert writer.stats()["dropped"] == 2
+    await writer.stop()
+
+
+async def test_not_started_and_failed_writes():
+    sink = Sink()
+    writer = AuditLogWriter(sink, maxsize=10, batch_size=10, flush_interval=60)
+    assert writer.record(_entry(1)) is False
+
+    sink.fail = True
+    writer.start()
+    writer.record(_entry(1))
+    await writer.stop()
+
+    assert writer.stats()["failed"] == 1
+    assert sink.batches == []
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from datetime import date
+import pytest
+from src.services import market_data, price_service
+from src.services.market_data import FakeProvider, MarketDataError, UpstreamBusy, UpstreamExecutor
+
+
+def test_fake_quotes_are_deterministic():
+    provider = FakeProvider()
+
+    quotes = provider.quotes(["PETR4.SA", "VALE3.SA"])
+
+    assert quotes == FakeProvider().quotes(["VALE3.SA", "PETR4.SA"])
+    assert quotes["PETR4.SA"] == provider.quote("PETR4.SA")
+    assert all(price > 0 and prev > 0 for price, prev in quotes.values())
+
+
+def test_fake_history_skips_weekends_and_agrees_across_ranges():
+    provider = FakeProvider()
+
+    week = provider.history(["PETR4.SA"], date(2024, 1, 1), date(2024, 1, 7))["PETR4.SA"]
+    day = provider.history(["PETR4.SA"], date(2024, 1, 3), date(2024, 1, 3))["PETR4.SA"]
+
+    assert [bar[0] for bar in week] == [date(2024, 1, d) for d in range(1, 6)]
+    assert day == [week[2]]
+    _, open_, high, low, close, _, _ = week[0]
+    assert low <= open_ <= high and low <= close <= high
+
+
+def test_fake_error_rate():
+    provider = FakeProvider(error_rate=1.0)
+
+    with pytest.raises(MarketDataError):
+        provider.quotes(["PETR4.SA"])
+    assert provider.calls == 1
+
+
+async def test_fetch_quotes_uses_configured_provider(monkeypatch):
+    provider = FakeProvider()
+    monkeypatch.setattr(market_data, "_provider", provider)
+    monkeypatch.setattr(price_service, "BATCH_SIZE", 2)
+
+    quotes = await price_service.fetch_quotes(["A.SA", "B.SA", "C.SA"])
+
+    assert quotes == provider.quotes(["A.SA", "B.SA", "C.SA"])
+    assert provider.calls == 3  # two batches, plus the call above
+
+
+async def test_fake_search():
+    results = await FakeProvider().search("petr", 3)
+
+    assert [r["symbol"] for r in results] == ["PETR3.SA", "PETR4.SA", "PETR5.SA"]
+
+
+async def test_upstream_timeout_frees_queued_calls():
+    executor = UpstreamExecutor(max_workers=1, max_pending=2)
+    release = threading.Event()
+    try:
+        slow = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(TimeoutError):
+            await executor.run(lambda: "queued", timeout=0.05)
+        assert executor.stats()["pending"] == 1  # the queued call was cancelled, not run
+
+        release.set()
+        assert await slow is True
+        assert await executor.run(lambda: "ok") == "ok"
+        assert executor.stats()["pending"] == 0
+        assert executor.stats()["timeouts"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+async def test_upstream_rejects_when_full():
+    executor = UpstreamExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        slow = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(UpstreamBusy):
+            await executor.run(lambda: "rejected")
+        assert executor.stats()["rejected"] == 1
+
+        release.set()
+        await slow
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+async def test_upstream_does_not_block_the_loop():
+    executor = UpstreamExecutor(max_workers=2, max_pending=4)
+    try:
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        await executor.run(time.sleep, 0.2)
+        task.cancel()
+
+        assert ticks >= 10
+    finally:
+        executor.shutdown()
@@ -0,0 +1,65 @@
+from decimal import Decimal
+from uuid import uuid4
+import pytest
+from src.services.portfolio_service import value_rows
+
+
+def test_value_rows_computes_positions_and_totals():
+    joao, maria = uuid4(), uuid4()
+    rows = [
+        (joao, "PETR4.SA", Decimal("100"), Decimal("30"), Decimal("3000"), Decimal("40"), Decimal("38")),
+        (maria, "VALE3.SA", Decimal("10"), Decimal("60"), Decimal("600"), Decimal("50"), Decimal("55")),
+        (joao, "ITUB4.SA", Decimal("50"), Decimal("20"), Decimal("1000"), Decimal("20"), Decimal("20")),
+    ]
+
+    portfolios = value_rows(rows)
+
+    p = portfolios[joao]
+    assert p["market_value"] == pytest.approx(5000)
+    assert p["pnl"] == pytest.approx(1000)
+    assert p["pnl_pct"] == pytest.approx(0.25)
+    assert p["day_change"] == pytest.approx(200)
+    assert p["day_change_pct"] == pytest.approx(200 / 4800)
+    weights = {pos["ticker"]: pos["weight"] for pos in p["positions"]}
+    assert weights == {"PETR4.SA": pytest.approx(0.8), "ITUB4.SA": pytest.approx(0.2)}
+
+    m = portfolios[maria]
+    assert m["pnl"] == pytest.approx(-100)
+    assert m["positions"][0]["day_change"] == pytest.approx(-50)
+
+
+def test_value_rows_leaves_unpriced_positions_out_of_totals():
+    client = uuid4()
+    rows = [
+        (client, "PETR4.SA", 100, 30, 3000, 40, 38),
+        (client, "NOQUOTE3.SA", 10, 10, 100, None, None),
+    ]
+
+    p = value_rows(rows)[client]
+
+    assert p["market_value"] == pytest.approx(4000)
+    assert p["invested_amount"] == pytest.approx(3100)
+    assert p["pnl"] == pytest.approx(1000)
+    unpriced = p["positions"][1]
+    assert unpriced["price"] is None
+    assert unpriced["market_value"] is None
+    assert unpriced["weight"] is None
+
+
+def test_value_rows_empty():
+    assert value_rows([]) == {}
+
+
+def test_value_rows_day_change_skips_positions_without_prev_close():
+    client = uuid4()
+    rows = [
+        (client, "PETR4.SA", 10, 9, 90, 10, 9),
+        (client, "NEW3.SA", 10, 10, 100, 10, None),
+    ]
+
+    p = value_rows(rows)[client]
+
+    assert p["market_value"] == pytest.approx(200)
+    assert p["day_change"] == pytest.approx(10)
+    assert p["day_change_pct"] == pytest.approx(10 / 90)
+    assert p["positions"][1]["day_change"] is None
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from src.services import price_service
+from src.services.quote_cache import QuoteCache
+
+
+@pytest.fixture
+def cache(fake_redis, monkeypatch):
+    cache = QuoteCache(redis=fake_redis, local_ttl=60, redis_ttl=60, maxsize=100)
+    monkeypatch.setattr(price_service, "quote_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def fake_fetch(ticker):
+        calls.append(ticker)
+        await asyncio.sleep(0.05)
+        return 10.0, 9.5
+
+    async def fake_fetch_many(tickers):
+        calls.append(tuple(tickers))
+        await asyncio.sleep(0.05)
+        return {t: (10.0, 9.5) for t in tickers if t != "MISSING"}
+
+    async def fake_store(quotes):
+        return None
+
+    monkeypatch.setattr(price_service, "_fetch_quote", fake_fetch)
+    monkeypatch.setattr(price_service, "fetch_quotes", fake_fetch_many)
+    monkeypatch.setattr(price_service, "_store_quotes", fake_store)
+    return calls
+
+
+async def test_concurrent_misses_share_one_fetch(cache, upstream):
+    results = await asyncio.gather(
+        *(asyncio.shield(price_service._refresh_coalesced("PETR4.SA")) for _ in range(20))
+    )
+
+    assert results == [(10.0, 9.5)] * 20
+    assert upstream == ["PETR4.SA"]
+    assert cache.stats()["coalesced_local"] == 19
+    assert price_service._inflight == {}
+
+
+async def test_refresh_waits_for_peer_holding_lock(cache, fake_redis, upstream, monkeypatch):
+    monkeypatch.setattr(price_service.settings, "QUOTE_LOCK_WAIT_SEC", 1)
+    fake_redis.locks.add("lock:price:VALE3.SA")
+
+    async def peer_publishes():
+        await asyncio.sleep(0.05)
+        fake_redis.data["price:VALE3.SA"] = "60.0,59.0"
+
+    _, quote = await asyncio.gather(peer_publishes(), price_service._refresh_quote("VALE3.SA"))
+
+    assert quote == (60.0, 59.0)
+    assert upstream == []
+
+
+async def test_get_quotes_fetches_misses_in_one_batch(cache, upstream):
+    await cache.set("PETR4.SA", 38.0, 37.0)
+
+    class Session:
+        async def execute(self, stmt):
+            class Result:
+                def scalars(self):
+                    return self
+
+                def all(self):
+                    return []
+            return Result()
+
+    quotes = await price_service.get_quotes(Session(), ["PETR4.SA", "VALE3.SA", "ITUB4.SA", "MISSING", "VALE3.SA"])
+
+    assert quotes == {"PETR4.SA": (38.0, 37.0), "VALE3.SA": (10.0, 9.5), "ITUB4.SA": (10.0, 9.5)}
+    assert upstream == [("VALE3.SA", "ITUB4.SA", "MISSING")]
+    assert price_service._inflight == {}
+
+
+async def test_batch_refresh_waits_for_peers_holding_locks(cache, fake_redis, upstream, monkeypatch):
+    monkeypatch.setattr(price_service.settings, "QUOTE_LOCK_WAIT_SEC", 1)
+    fake_redis.locks.add("lock:price:VALE3.SA")
+
+    async def peer_publishes():
+        await asyncio.sleep(0.05)
+        fake_redis.data["price:VALE3.SA"] = "60.0,59.0"
+
+    _, quotes = await asyncio.gather(peer_publishes(), price_service._refresh_batch(["PETR4.SA", "VALE3.SA"]))
+
+    assert quotes == {"PETR4.SA": (10.0, 9.5), "VALE3.SA": (60.0, 59.0)}
+    assert upstream == [("PETR4.SA",)]
+    assert fake_redis.locks == {"lock:price:VALE3.SA"}  # ours released, the peer's untouched
+
+
+async def test_batch_refresh_fetches_when_peer_never_publishes(cache, fake_redis, upstream, monkeypatch):
+    monkeypatch.setattr(price_service.settings, "QUOTE_LOCK_WAIT_SEC", 0.1)
+    fake_redis.locks.add("lock:price:VALE3.SA")
+
+    quotes = await price_service._refresh_batch(["PETR4.SA", "VALE3.SA"])
+
+    assert quotes == {"PETR4.SA": (10.0, 9.5), "VALE3.SA": (10.0, 9.5)}
+    assert upstream == [("PETR4.SA",), ("VALE3.SA",)]
@@ -0,0 +1,55 @@
+import time
+from src.services.cache import LocalTTLCache
+from src.services.quote_cache import QuoteCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_local_cache_expires_entries():
+    cache = LocalTTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_quote_cache_reads_through_tiers(fake_redis):
+    redis = fake_redis
+    redis.data["price:PETR4.SA"] = "38.5,37.9"
+    cache = QuoteCache(redis=redis, local_ttl=60, redis_ttl=60, maxsize=100)
+
+    assert await cache.get_many(["PETR4.SA", "VALE3.SA"]) == {"PETR4.SA": (38.5, 37.9)}
+    assert await cache.get("PETR4.SA") == (38.5, 37.9)
+
+    stats = cache.stats()
+    assert stats["redis_hit"] == 1
+    assert stats["local_hit"] == 1
+    assert stats["miss"] == 1
+
+
+async def test_quote_cache_set_many_writes_both_tiers(fake_redis):
+    redis = fake_redis
+    cache = QuoteCache(redis=redis, local_ttl=60, redis_ttl=60, maxsize=100)
+
+    await cache.set_many({"ITUB4.SA": (33.0, 32.5)})
+
+    assert redis.data["price:ITUB4.SA"] == "33.0,32.5"
+    assert cache.local.get("ITUB4.SA") == (33.0, 32.5)
+
+
+async def test_quote_cache_treats_redis_errors_as_misses(broken_redis):
+    cache = QuoteCache(redis=broken_redis, local_ttl=60, redis_ttl=60, maxsize=100)
+
+    assert await cache.get("PETR4.SA") is None
+    assert cache.stats()["redis_error"] == 1
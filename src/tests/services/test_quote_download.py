@@ -0,0 +1,73 @@
+import math
+import sys
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+from src.db.models.core_models import PriceQuote
+from src.services import price_service
+from src.services.market_data import YahooProvider
+
+DAYS = pd.to_datetime(["2025-03-06", "2025-03-07"])
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+
+@pytest.fixture
+def download(monkeypatch):
+    frames = {}
+
+    def fake_download(symbols, **kwargs):
+        return frames["data"]
+
+    monkeypatch.setitem(sys.modules, "yfinance", SimpleNamespace(download=fake_download))
+    return frames
+
+
+async def test_upsert_quotes_in_chunks(monkeypatch):
+    monkeypatch.setattr(price_service, "UPSERT_CHUNK_SIZE", 2)
+    session = FakeSession()
+    quotes = {f"T{i}.SA": (float(i), float(i) - 0.5) for i in range(5)}
+
+    assert await price_service.upsert_quotes(session, quotes) == 5
+
+    assert [len(stmt._multi_values[0]) for stmt in session.statements] == [2, 2, 1]
+    assert [row[PriceQuote.__table__.c.ticker] for stmt in session.statements for row in stmt._multi_values[0]] == list(quotes)
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (ticker) DO UPDATE" in sql
+
+
+async def test_upsert_quotes_empty():
+    session = FakeSession()
+
+    assert await price_service.upsert_quotes(session, {}) == 0
+    assert session.statements == []
+
+
+def test_quotes_from_multi_column_frame(download):
+    columns = pd.MultiIndex.from_product([["Close", "Open"], ["PETR4.SA", "VALE3.SA"]], names=["Price", "Ticker"])
+    download["data"] = pd.DataFrame(
+        [[38.0, math.nan, 37.5, math.nan], [38.5, 61.0, 38.1, 60.2]], index=DAYS, columns=columns
+    )
+
+    quotes = YahooProvider().quotes(["PETR4.SA", "VALE3.SA", "MISSING.SA"])
+
+    assert quotes == {"PETR4.SA": (38.5, 38.0), "VALE3.SA": (61.0, 61.0)}  # one row: prev = price
+
+
+def test_quotes_from_single_symbol_series(download):
+    download["data"] = pd.DataFrame({"Close": [38.0, 38.5], "Open": [37.5, 38.1]}, index=DAYS)
+
+    assert YahooProvider().quotes(["PETR4.SA"]) == {"PETR4.SA": (38.5, 38.0)}
+
+
+def test_quotes_without_data(download):
+    download["data"] = pd.DataFrame()
+
+    assert YahooProvider().quotes(["PETR4.SA"]) == {}
@@ -0,0 +1,58 @@
+from sqlalchemy.dialects import postgresql
+from src.services.ticker_index import TickerIndex, search_assets
+
+
+def _entry(symbol, name):
+    return {"symbol": symbol, "shortname": name, "exchDisp": "SAO", "typeDisp": "acao"}
+
+
+def _index():
+    index = TickerIndex()
+    index.add(_entry("PETR4.SA", "Petrobras PN"))
+    index.add(_entry("PETR3.SA", "Petrobras ON"))
+    index.add(_entry("PRIO3.SA", "PetroRio"))
+    index.add(_entry("VALE3.SA", "Vale ON"))
+    return index
+
+
+def test_ticker_prefix_with_or_without_suffix():
+    index = _index()
+
+    assert [r["symbol"] for r in index.search("petr", 10)] == ["PETR3.SA", "PETR4.SA", "PRIO3.SA"]
+    assert [r["symbol"] for r in index.search("VALE3", 10)] == ["VALE3.SA"]
+    assert [r["symbol"] for r in index.search("vale3.sa", 10)] == ["VALE3.SA"]
+
+
+def test_name_words_are_intersected():
+    index = _index()
+
+    assert [r["symbol"] for r in index.search("petrobras on", 10)] == ["PETR3.SA"]
+    assert index.search("petrobras xyz", 10) == []
+
+
+def test_limit_and_empty_query():
+    index = _index()
+
+    assert len(index.search("p", 2)) == 2
+    assert index.search("   ", 10) == []
+    assert len(index) == 4
+
+
+class CapturingSession:
+    async def execute(self, stmt):
+        self.stmt = stmt
+        return self
+
+    def all(self):
+        return []
+
+
+async def test_search_assets_escapes_like_wildcards():
+    session = CapturingSession()
+
+    await search_assets(session, "PETR_4%\\")
+
+    compiled = session.stmt.compile(dialect=postgresql.dialect())
+    assert "ESCAPE '\\'" in str(compiled)
+    patterns = {v for v in compiled.params.values() if isinstance(v, str) and v.startswith("%")}
+    assert patterns == {"%PETR\\_4\\%\\\\%"}
@@ -0,0 +1,65 @@
+import httpx
+import pytest
+from src.services import market_data, ticker_search
+from src.services.cache import LocalTTLCache
+from src.services.ticker_index import TickerIndex
+
+
+@pytest.fixture
+def upstream(fake_redis, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.url.params["q"])
+        return httpx.Response(200, json={"quotes": [
+            {"symbol": "PETR4.SA", "shortname": "PETROBRAS PN", "exchDisp": "São Paulo", "typeDisp": "Equity"},
+            {"shortname": "no symbol"},
+        ]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(market_data, "get_http_client", lambda: client)
+    monkeypatch.setattr(market_data, "_provider", market_data.YahooProvider())
+    monkeypatch.setattr(ticker_search, "redis_client", fake_redis)
+    monkeypatch.setattr(ticker_search, "local_cache", LocalTTLCache(maxsize=10, ttl=60))
+    monkeypatch.setattr(ticker_search, "ticker_index", TickerIndex())
+    return calls
+
+
+async def test_search_is_cached_per_normalized_query(upstream, fake_redis):
+    first = await ticker_search.search_tickers("Petr", 8)
+    second = await ticker_search.search_tickers("  PETR ", 8)
+
+    assert first == second == [
+        {"symbol": "PETR4.SA", "shortname": "PETROBRAS PN", "exchDisp": "São Paulo", "typeDisp": "Equity"}
+    ]
+    assert upstream == ["petr"]
+    assert "search:8:petr" in fake_redis.data
+
+
+async def test_search_reads_redis_tier(upstream, fake_redis):
+    fake_redis.data["search:8:vale"] = '[{"symbol": "VALE3.SA"}]'
+
+    assert await ticker_search.search_tickers("vale", 8) == [{"symbol": "VALE3.SA"}]
+    assert upstream == []
+
+
+async def test_known_symbol_is_answered_locally(upstream):
+    ticker_search.ticker_index.add(
+        {"symbol": "VALE3.SA", "shortname": "Vale ON", "exchDisp": "SAO", "typeDisp": "acao"}
+    )
+
+    results = await ticker_search.search_tickers("vale3", 8)
+
+    assert [r["symbol"] for r in results] == ["VALE3.SA"]
+    assert upstream == []
+
+
+async def test_partial_local_results_are_completed_remotely(upstream):
+    ticker_search.ticker_index.add(
+        {"symbol": "PETR3.SA", "shortname": "Petrobras ON", "exchDisp": "SAO", "typeDisp": "acao"}
+    )
+
+    results = await ticker_search.search_tickers("petr", 8)
+
+    assert [r["symbol"] for r in results] == ["PETR3.SA", "PETR4.SA"]
+    assert upstream == ["petr"]
@@ -0,0 +1,79 @@
+import math
+import uuid
+from datetime import date
+from decimal import Decimal
+from src.services.market_data import FakeProvider
+from src.tasks import backfill_daily_returns as backfill
+
+A, B, C = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return FakeResult(self.rows)
+
+
+async def test_load_plan_resumes_after_latest_date():
+    session = FakeSession([(A, "PETR4.SA", date(2025, 3, 7)), (B, "VALE3.SA", None)])
+
+    plan = await backfill._load_plan(session, date(2020, 1, 1), ["PETR4.SA", "VALE3.SA"])
+
+    assert plan == [(A, "PETR4.SA", date(2025, 3, 8)), (B, "VALE3.SA", date(2020, 1, 1))]
+    assert "IN" in str(session.statements[0])
+
+
+def test_group_by_start():
+    today = date(2025, 3, 10)
+    plan = [
+        (A, "PETR4.SA", date(2025, 3, 8)),
+        (B, "VALE3.SA", date(2020, 1, 1)),
+        (C, "ITUB4.SA", date(2025, 3, 8)),
+        (uuid.uuid4(), "BBAS3.SA", date(2025, 3, 11)),
+    ]
+
+    by_start, up_to_date = backfill._group_by_start(plan, today)
+
+    assert by_start == {
+        date(2025, 3, 8): [(A, "PETR4.SA"), (C, "ITUB4.SA")],
+        date(2020, 1, 1): [(B, "VALE3.SA")],
+    }
+    assert up_to_date == 1
+
+
+def test_to_records_from_provider_history():
+    history = FakeProvider().history(["PETR4.SA"], date(2025, 3, 3), date(2025, 3, 9))
+
+    records = backfill._to_records({A: "PETR4.SA", B: "MISSING.SA"}, history)
+
+    assert [r[2] for r in records] == [date(2025, 3, d) for d in range(3, 8)]
+    assert {r[1] for r in records} == {A}
+    assert all(isinstance(r[6], Decimal) for r in records)
+
+
+def test_to_records_nan_to_none_and_one_row_per_date():
+    day = date(2025, 3, 3)
+    history = {"PETR4.SA": [
+        (day, 1.0, 2.0, 0.5, 1.5, 100.0, 1.5),
+        (day, math.nan, None, 0.5, 1.6, math.nan, 1.6),
+    ]}
+
+    records = backfill._to_records({A: "PETR4.SA"}, history)
+
+    assert len(records) == 1
+    _, asset_id, row_day, open_, high, low, close, volume, adj_close, _ = records[0]
+    assert (asset_id, row_day) == (A, day)
+    assert open_ is None and high is None and volume is None
+    assert (low, close, adj_close) == (Decimal("0.5"), Decimal("1.6"), Decimal("1.6"))
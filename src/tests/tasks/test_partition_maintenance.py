@@ -0,0 +1,68 @@
+from datetime import date
+import pytest
+from src.config import settings
+from src.tasks.partition_maintenance import PartitionedTable, _expire_partition, plan
+
+LOGS = PartitionedTable("logs", "created_at", monthly=True, premake=3, retention=12)
+DAILY_RETURNS = PartitionedTable("daily_returns", "date", monthly=False, premake=1, retention=None)
+
+
+def test_names_round_trip():
+    assert LOGS.partition_name(date(2026, 3, 1)) == "logs_y2026m03"
+    assert LOGS.parse("logs_y2026m03") == date(2026, 3, 1)
+    assert LOGS.parse("logs_default") is None
+    assert DAILY_RETURNS.parse("daily_returns_y2024") == date(2024, 1, 1)
+    assert DAILY_RETURNS.parse("logs_y2024") is None
+
+
+def test_monthly_premake_crosses_year_and_skips_existing():
+    to_create, to_expire = plan(LOGS, date(2026, 11, 20), ["logs_default", "logs_y2026m11", "logs_y2026m12"])
+
+    assert to_create == [date(2027, 1, 1), date(2027, 2, 1)]
+    assert to_expire == []
+
+
+def test_monthly_retention():
+    existing = ["logs_default", "logs_y2025m09", "logs_y2025m10", "logs_y2025m11"]
+
+    _, to_expire = plan(LOGS, date(2026, 11, 2), existing)
+
+    assert to_expire == ["logs_y2025m09", "logs_y2025m10"]
+
+
+def test_yearly_without_retention_keeps_history():
+    to_create, to_expire = plan(DAILY_RETURNS, date(2026, 6, 1), ["daily_returns_y2019", "daily_returns_y2026"])
+
+    assert to_create == [date(2027, 1, 1)]
+    assert to_expire == []
+
+
+class RecordingConn:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt))
+
+
+@pytest.mark.parametrize("schema", [None, ""])
+async def test_expire_drops_without_archive_schema(monkeypatch, schema):
+    monkeypatch.setattr(settings, "PARTITION_ARCHIVE_SCHEMA", schema)
+    conn = RecordingConn()
+
+    await _expire_partition(conn, LOGS, "logs_y2025m01")
+
+    assert conn.statements == ["DROP TABLE logs_y2025m01"]
+
+
+async def test_expire_archives_into_schema(monkeypatch):
+    monkeypatch.setattr(settings, "PARTITION_ARCHIVE_SCHEMA", "archive")
+    conn = RecordingConn()
+
+    await _expire_partition(conn, LOGS, "logs_y2025m01")
+
+    assert conn.statements == [
+        "CREATE SCHEMA IF NOT EXISTS archive",
+        "ALTER TABLE logs DETACH PARTITION logs_y2025m01",
+        "ALTER TABLE logs_y2025m01 SET SCHEMA archive",
+    ]
@@ -0,0 +1,104 @@
+import asyncio
+from contextlib import asynccontextmanager
+from src.tasks import refresh_quotes as task
+
+
+class InlineRuntime:
+    @staticmethod
+    def run(coro, **_):
+        return asyncio.run(coro)
+
+
+def test_shards_partition_the_tickers():
+    tickers = [f"T{i:04d}.SA" for i in range(1000)]
+
+    shards = [[t for t in tickers if task.shard_of(t, 4) == s] for s in range(4)]
+
+    assert sorted(sum(shards, [])) == tickers
+    assert all(150 < len(shard) < 350 for shard in shards)
+    assert task.shard_of("PETR4.SA", 4) == task.shard_of("PETR4.SA", 4)
+
+
+def test_fan_out_builds_a_staggered_chord(monkeypatch):
+    calls = {}
+
+    class FakeChord:
+        def __init__(self, header):
+            calls["header"] = header
+
+        def __call__(self, callback):
+            calls["callback"] = callback
+            return type("Result", (), {"id": "summary-id"})()
+
+    async def load_tickers():
+        return tickers
+
+    tickers = [f"T{i:02d}.SA" for i in range(30)]
+    monkeypatch.setattr(task, "chord", FakeChord)
+    monkeypatch.setattr(task, "runtime", InlineRuntime)
+    monkeypatch.setattr(task, "_load_tickers", load_tickers)
+    monkeypatch.setattr(task.settings, "REFRESH_SHARD_STAGGER_SEC", 2)
+
+    assert task.refresh_quotes(3) == {"shards": 3, "summary_id": "summary-id"}
+    assert [s.args[:2] for s in calls["header"]] == [(0, 3), (1, 3), (2, 3)]
+    for shard, signature in enumerate(calls["header"]):
+        assert signature.args[2] == [t for t in tickers if task.shard_of(t, 3) == shard]
+    assert [s.options["countdown"] for s in calls["header"]] == [0, 2, 4]
+    assert calls["callback"].task == "refresh_quotes_summary"
+
+
+def test_summary_totals_and_per_shard_durations():
+    results = [
+        {"shard": 1, "tickers": 10, "cached": 2, "fetched": 7, "failed": 1, "elapsed_sec": 3.0},
+        {"shard": 0, "tickers": 20, "cached": 5, "fetched": 15, "failed": 0, "elapsed_sec": 1.5},
+        {"shard": 2, "error": "TimeoutError()"},
+    ]
+
+    summary = task.summarize(results, elapsed=5.0)
+
+    assert {k: summary[k] for k in task.COUNTS} == {"tickers": 30, "cached": 7, "fetched": 22, "failed": 1}
+    assert summary["shards"] == 3 and summary["shard_errors"] == 1
+    assert summary["tickers_per_sec"] == 6.0
+    assert (summary["shard_min_sec"], summary["shard_max_sec"]) == (1.5, 3.0)
+    assert summary["per_shard"] == [
+        {"shard": 0, "tickers": 20, "elapsed_sec": 1.5},
+        {"shard": 1, "tickers": 10, "elapsed_sec": 3.0},
+        {"shard": 2, "error": "TimeoutError()"},
+    ]
+
+
+async def test_shards_split_the_download_concurrency(monkeypatch):
+    concurrency = []
+
+    class Cache:
+        async def get_many(self, tickers):
+            return {}
+
+        async def set_many(self, quotes):
+            return None
+
+    @asynccontextmanager
+    async def session():
+        class Session:
+            async def commit(self):
+                return None
+        yield Session()
+
+    async def fetch_quotes(symbols, max_concurrency=None):
+        concurrency.append(max_concurrency)
+        return {s: (10.0, 9.5) for s in symbols}
+
+    async def upsert_quotes(session, quotes):
+        return len(quotes)
+
+    monkeypatch.setattr(task, "quote_cache", Cache())
+    monkeypatch.setattr(task, "async_session", session)
+    monkeypatch.setattr(task, "fetch_quotes", fetch_quotes)
+    monkeypatch.setattr(task, "upsert_quotes", upsert_quotes)
+    monkeypatch.setattr(task.settings, "REFRESH_MAX_CONCURRENCY", 8)
+
+    summary = await task._refresh_quotes_async(["A.SA", "B.SA"], shard=1, shards=4)
+    await task._refresh_quotes_async(["A.SA"], shard=0, shards=16)
+
+    assert summary["tickers"] == summary["fetched"] == 2 and summary["shard"] == 1
+    assert concurrency == [2, 1]
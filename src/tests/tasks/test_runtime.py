@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.tasks import runtime as runtime_module
+from src.tasks.runtime import WorkerRuntime
+
+
+@pytest.fixture
+def runtime(monkeypatch):
+    async def no_clients():
+        return None
+
+    monkeypatch.setattr(runtime_module, "_close_clients", no_clients)
+    rt = WorkerRuntime()
+    yield rt
+    rt.stop()
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+def test_tasks_share_one_persistent_loop(runtime):
+    first = runtime.run(_current_loop())
+    second = runtime.run(_current_loop())
+
+    assert first is second is runtime.loop
+    assert first.is_running()
+
+
+def test_tasks_from_several_threads_run_concurrently(runtime):
+    results = []
+
+    def worker():
+        results.append(runtime.run(asyncio.sleep(0.2, result="done")))
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["done"] * 10
+    assert time.perf_counter() - started < 1
+
+
+def test_timeout_cancels_the_coroutine(runtime):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        runtime.run(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+
+
+def test_async_task_runs_on_the_worker_loop(monkeypatch, runtime):
+    monkeypatch.setattr(runtime_module, "runtime", runtime)
+
+    @runtime_module.async_task(name="test_runtime_echo")
+    async def echo(value):
+        await asyncio.sleep(0)
+        return value, asyncio.get_running_loop()
+
+    value, loop = echo(3)
+
+    assert value == 3
+    assert loop is runtime.loop
+    assert echo.name == "test_runtime_echo"